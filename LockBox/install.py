@@ -1,32 +1,73 @@
-import os, sys, subprocess, shutil
+import os, subprocess, shutil, venv
+from concurrent.futures import ThreadPoolExecutor
 
 APP_VERSION = "v0.3"
 
 
+def _copy_file(src, dst):
+    """Kernel-side copy (sendfile / CopyFileExW); falls back to shutil.copyfile."""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            if not ctypes.windll.kernel32.CopyFileExW(os.path.abspath(src), os.path.abspath(dst), None, None, None, 0):
+                raise ctypes.WinError()
+            return
+        size = os.path.getsize(src)
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            offset = 0
+            while offset < size:
+                n = os.sendfile(d.fileno(), s.fileno(), offset, size - offset)
+                if n == 0:
+                    break
+                offset += n
+        if offset == size:
+            return
+    except (OSError, AttributeError):
+        pass
+    shutil.copyfile(src, dst)
+
+
+def _write_script(path, content, mode=0o755):
+    """Write an executable launcher in one go; replaces a `chmod +x` subprocess."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), mode)
+    try:
+        if hasattr(os, 'fchmod'):
+            os.fchmod(fd, mode)  # O_CREAT's mode doesn't apply to an existing file
+        os.write(fd, content.encode())
+    finally:
+        os.close(fd)
+
+
 def main():
     print(f"[LockBox {APP_VERSION} Setup]...")
-    subprocess.check_call([sys.executable, "-m", "venv", "venv"])
+    venv.EnvBuilder(with_pip=True, symlinks=(os.name != 'nt')).create("venv")
     pip = os.path.join("venv", "Scripts" if os.name == 'nt' else "bin", "pip")
-    subprocess.check_call([pip, "install", "click", "tabulate", "pyyaml"])
+    cmd = [pip, "install", "--no-compile", "--disable-pip-version-check", "-r", "requirements.txt"]
+    if os.path.isdir("wheelhouse"):
+        # Offline install from a prepared wheel set:
+        #   pip download -d wheelhouse -r requirements.txt
+        cmd += ["--no-index", "--find-links", "wheelhouse"]
+    else:
+        # PyYAML's wheels bundle libyaml (CSafeLoader); avoid a pure-Python sdist build.
+        cmd.append("--prefer-binary")
+    subprocess.check_call(cmd)
 
-    for d in ["images", "containers", "state", "logs"]:
-        os.makedirs(d, exist_ok=True)
+    dirs = ["images", "containers", "state", "logs"]
+    with ThreadPoolExecutor(len(dirs)) as ex:
+        list(ex.map(lambda d: os.makedirs(d, exist_ok=True), dirs))
     if os.path.exists("base_images/alpine.tar.gz"):
-        shutil.copy("base_images/alpine.tar.gz", "images/alpine.tar.gz")
+        _copy_file("base_images/alpine.tar.gz", "images/alpine.tar.gz")
 
     if os.name == 'nt':
         if os.path.exists("fix_path.bat"):
             subprocess.call("fix_path.bat", shell=True)
         with open("lbox.bat", "w", newline='\r\n') as f:
-            f.write('@echo off\n')
-            f.write('set "SCRIPT_DIR=%~dp0"\n')
-            f.write('"%SCRIPT_DIR%venv\\Scripts\\python.exe" "%SCRIPT_DIR%src\\lbox.py" %*\n')
-        with open("lbox", "w", newline='\n') as f:
-            f.write('#!/bin/sh\nDIR="$(cd "$(dirname "$0")" && pwd)"\n"$DIR/venv/Scripts/python.exe" "$DIR/src/lbox.py" "$@"\n')
+            f.write('@echo off\n'
+                    'set "SCRIPT_DIR=%~dp0"\n'
+                    '"%SCRIPT_DIR%venv\\Scripts\\python.exe" "%SCRIPT_DIR%src\\lbox.py" %*\n')
+        _write_script("lbox", '#!/bin/sh\nDIR="$(cd "$(dirname "$0")" && pwd)"\n"$DIR/venv/Scripts/python.exe" "$DIR/src/lbox.py" "$@"\n')
     else:
-        with open("lbox", "w", newline='\n') as f:
-            f.write('#!/bin/bash\nif [ "$EUID" -ne 0 ]; then echo "Sudo req"; exit; fi\nDIR="$(cd "$(dirname "$0")" && pwd)"\n"$DIR/venv/bin/python" "$DIR/src/lbox.py" "$@"\n')
-        subprocess.call(['chmod', '+x', 'lbox'])
+        _write_script("lbox", '#!/bin/bash\nif [ "$EUID" -ne 0 ]; then echo "Sudo req"; exit; fi\nDIR="$(cd "$(dirname "$0")" && pwd)"\n"$DIR/venv/bin/python" "$DIR/src/lbox.py" "$@"\n')
 
     print("Done. Please restart terminal.")
 
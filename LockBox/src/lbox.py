@@ -3,22 +3,33 @@ import click
 import os
 import sys
 import shutil
+import stat
 import tarfile
 import subprocess
 import uuid
 import platform
 import socket
+import select
 import threading
 import time
 import json
-import yaml
 import hashlib
+import random
+import urllib.error
 import urllib.request
 import re
 import shlex
 import ctypes
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
 from datetime import datetime
-from lbox_create import register_create_commands
+from lbox_create import load_compose_file, register_create_commands
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ==========================================
 # CONFIGURATION
@@ -31,6 +42,11 @@ CONTAINERS_DIR = os.path.join(INSTALL_DIR, "containers")
 STATE_DIR = os.path.join(INSTALL_DIR, "state")
 LOGS_DIR = os.path.join(INSTALL_DIR, "logs")
 VOLUMES_DIR = os.path.join(INSTALL_DIR, "volumes")
+# Opt-in thread count for parallel image unpacking in LinuxEngine.run (0 = system tar).
+try:
+    EXTRACT_WORKERS = max(0, int(os.environ.get("LOCKBOX_EXTRACT_WORKERS", "").strip() or 0))
+except ValueError:
+    EXTRACT_WORKERS = 0
 
 for d in [IMAGES_DIR, CONTAINERS_DIR, STATE_DIR, LOGS_DIR, VOLUMES_DIR]:
     if not os.path.exists(d): os.makedirs(d)
@@ -38,8 +54,101 @@ for d in [IMAGES_DIR, CONTAINERS_DIR, STATE_DIR, LOGS_DIR, VOLUMES_DIR]:
 # ==========================================
 # STATE & UTILS
 # ==========================================
+# Parsed state files keyed by path -> (st_mtime_ns, st_size, data), plus a
+# name -> id index so name lookups do not need to re-read every state file.
+_STATE_CACHE = {}
+_NAME_INDEX = {}
+# (STATE_DIR st_mtime_ns, [(id, name, host_ports)]). Only fields fixed at creation are kept,
+# so the summary can be reused for as long as the STATE_DIR mtime is unchanged.
+_STATE_SUMMARY = None
+
+
+def _json_loads(raw):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def _json_dumps(obj, indent=True):
+    """Serialize obj to str, using orjson when it is installed."""
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=4 if indent else None)
+
+
+def _state_path(cid):
+    return os.path.join(STATE_DIR, cid + '.json')
+
+
+def _cache_state(path, st, data):
+    _STATE_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    if data.get('name'):
+        _NAME_INDEX[data['name']] = data.get('id')
+
+
+def _copy_json(value):
+    """Deep-copy a parsed JSON document; much cheaper than copy.deepcopy for plain dicts/lists."""
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+def _read_state(path, st):
+    """Return a private copy of the parsed state at path, reusing the cache while (mtime, size) match.
+
+    Nested ports/volumes/labels/envs are copied too, so callers may mutate the result freely.
+    """
+    cached = _STATE_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return _copy_json(cached[2])
+    with open(path, 'rb') as f:
+        data = _json_loads(f.read())
+    _cache_state(path, st, data)
+    return _copy_json(data)
+
+
 def save_state(cid, data):
-    with open(os.path.join(STATE_DIR, f"{cid}.json"), 'w') as f: json.dump(data, f, indent=4)
+    """Write a state file atomically so concurrent readers never see a truncated document."""
+    path = _state_path(cid)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(_json_dumps(data))
+        f.flush()
+        st = os.fstat(f.fileno())
+    for attempt in range(5):
+        try:
+            os.replace(tmp, path)
+            break
+        except PermissionError:
+            # Windows refuses to replace a file another process has open; readers hold it briefly.
+            if attempt == 4:
+                os.remove(tmp)
+                raise
+            time.sleep(0.01 * (attempt + 1))
+    _cache_state(path, st, _copy_json(data))
+    _invalidate_state_summary()
+
+
+def _invalidate_state_summary():
+    global _STATE_SUMMARY
+    _STATE_SUMMARY = None
+
+
+def state_summary():
+    """Return (id, name, host_ports) for every container, rescanning only when STATE_DIR changes."""
+    global _STATE_SUMMARY
+    mtime = os.stat(STATE_DIR).st_mtime_ns
+    if _STATE_SUMMARY is None or _STATE_SUMMARY[0] != mtime:
+        rows = []
+        for state in iter_states():
+            host_ports = frozenset(
+                hp for hp in (_extract_host_port(p) for p in state.get('ports') or [])
+                if hp is not None
+            )
+            rows.append((state.get('id'), state.get('name'), host_ports))
+        _STATE_SUMMARY = (mtime, rows)
+    return _STATE_SUMMARY[1]
 
 
 def iter_states():
@@ -48,20 +157,30 @@ def iter_states():
         if not entry.is_file() or not entry.name.endswith('.json'):
             continue
         try:
-            with open(entry.path) as f:
-                yield json.load(f)
+            yield _read_state(entry.path, entry.stat(follow_symlinks=False))
         except Exception:
             continue
 
 
 def load_state(identifier):
-    path = os.path.join(STATE_DIR, f"{identifier}.json")
-    if os.path.exists(path):
+    path = _state_path(identifier)
+    try:
+        return _read_state(path, os.stat(path))
+    except FileNotFoundError:
+        pass
+    except Exception:
+        return None
+
+    cid = _NAME_INDEX.get(identifier)
+    if cid:
         try:
-            with open(path) as f:
-                return json.load(f)
+            indexed_path = _state_path(cid)
+            data = _read_state(indexed_path, os.stat(indexed_path))
+            if data.get('name') == identifier:
+                return data
         except Exception:
-            return None
+            pass
+        _NAME_INDEX.pop(identifier, None)
 
     for data in iter_states():
         if data.get('name') == identifier:
@@ -74,9 +193,14 @@ def get_id_by_name(name):
     return s['id'] if s else None
 
 def remove_state(cid):
+    path = _state_path(cid)
+    cached = _STATE_CACHE.pop(path, None)
+    if cached and _NAME_INDEX.get(cached[2].get('name')) == cid:
+        _NAME_INDEX.pop(cached[2]['name'], None)
     try:
-        if os.path.exists(os.path.join(STATE_DIR, f"{cid}.json")): os.remove(os.path.join(STATE_DIR, f"{cid}.json"))
-    except: pass
+        os.remove(path)
+    except OSError: pass
+    _invalidate_state_summary()
 
 def remove_service_artifacts_by_container_name(name):
     state = load_state(name)
@@ -122,6 +246,34 @@ def run_quiet(cmd_list):
         return True
     except: return False
 
+MS_BIND = 4096
+MNT_DETACH = 2
+_LIBC = None
+
+def _libc():
+    global _LIBC
+    if _LIBC is None:
+        _LIBC = ctypes.CDLL(None, use_errno=True)
+    return _LIBC
+
+def _mount(source, target, fstype=None, flags=0):
+    """mount(2) without spawning mount(8); returns False on failure like a failed command."""
+    try:
+        libc = _libc()
+        rc = libc.mount(os.fsencode(source), os.fsencode(target), os.fsencode(fstype) if fstype else None,
+                        ctypes.c_ulong(flags), None)
+    except (OSError, AttributeError):
+        cmd = ['mount', '--bind', source, target] if flags & MS_BIND else ['mount', '-t', fstype, source, target]
+        return run_quiet(cmd)
+    return rc == 0
+
+def _umount_lazy(target):
+    """umount2(MNT_DETACH), the syscall behind `umount -l`."""
+    try:
+        return _libc().umount2(os.fsencode(target), MNT_DETACH) == 0
+    except (OSError, AttributeError):
+        return run_quiet(['umount', '-l', target])
+
 def is_windows_admin():
     if not IS_WINDOWS:
         return True
@@ -166,6 +318,77 @@ def _log_windows_service_error(message):
     except Exception:
         pass
 
+class DirectoryWatcher:
+    """Block until a directory changes, using native change notifications when available.
+
+    Windows uses FindFirstChangeNotificationW and Linux uses inotify through libc;
+    anything else (or a failed setup) falls back to sleeping for the poll interval.
+    """
+
+    def __init__(self, path, poll_interval=0.25):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._handle = None
+        self._fd = None
+        try:
+            if IS_WINDOWS:
+                self._open_windows()
+            else:
+                self._open_inotify()
+        except Exception:
+            self.close()
+
+    def _open_windows(self):
+        kernel32 = ctypes.windll.kernel32
+        kernel32.FindFirstChangeNotificationW.argtypes = [ctypes.c_wchar_p, ctypes.c_bool, ctypes.c_uint32]
+        kernel32.FindFirstChangeNotificationW.restype = ctypes.c_void_p
+        # FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_SIZE | FILE_NOTIFY_CHANGE_LAST_WRITE
+        handle = kernel32.FindFirstChangeNotificationW(self.path, False, 0x01 | 0x08 | 0x10)
+        if handle and handle != ctypes.c_void_p(-1).value:
+            self._handle = handle
+
+    def _open_inotify(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return
+        # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        if libc.inotify_add_watch(fd, os.fsencode(self.path), 0x002 | 0x008 | 0x080 | 0x100 | 0x200) < 0:
+            os.close(fd)
+            return
+        self._fd = fd
+
+    def wait(self, timeout):
+        """Return once the directory changes or timeout seconds pass."""
+        if self._handle:
+            kernel32 = ctypes.windll.kernel32
+            kernel32.WaitForSingleObject(ctypes.c_void_p(self._handle), int(timeout * 1000))
+            kernel32.FindNextChangeNotification(ctypes.c_void_p(self._handle))
+        elif self._fd is not None:
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if ready:
+                try:
+                    os.read(self._fd, 65536)
+                except BlockingIOError:
+                    pass
+        else:
+            time.sleep(min(timeout, self.poll_interval))
+
+    def close(self):
+        if self._handle:
+            ctypes.windll.kernel32.FindCloseChangeNotification(ctypes.c_void_p(self._handle))
+            self._handle = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def check_port_free(port):
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     try:
@@ -212,31 +435,28 @@ def find_container_conflicts(requested_name=None, requested_ports=None, ignore_n
         }
     )
 
+    def status_of(cid):
+        # Status changes in place, so it is read fresh for the (rare) conflicting entries.
+        return (load_state(cid) or {}).get('status', 'unknown')
+
     conflicts = {"name": None, "ports": []}
-    for state in iter_states():
-        state_name = state.get('name')
+    for state_id, state_name, existing_host_ports in state_summary():
         if state_name in ignore_names:
             continue
 
         if requested_name and state_name == requested_name:
             conflicts['name'] = {
                 'requested_name': requested_name,
-                'existing_id': state.get('id'),
-                'status': state.get('status', 'unknown')
+                'existing_id': state_id,
+                'status': status_of(state_id)
             }
 
-        existing_ports = state.get('ports') or []
-        existing_host_ports = {
-            hp for hp in (_extract_host_port(p) for p in existing_ports)
-            if hp is not None
-        }
-
         overlap = sorted(set(requested_host_ports) & existing_host_ports)
         if overlap:
             conflicts['ports'].append({
-                'container_name': state_name or state.get('id'),
-                'container_id': state.get('id'),
-                'status': state.get('status', 'unknown'),
+                'container_name': state_name or state_id,
+                'container_id': state_id,
+                'status': status_of(state_id),
                 'ports': overlap,
             })
 
@@ -272,42 +492,170 @@ def format_conflict_error(action_name, conflicts):
 
 def calculate_file_hash(filepath):
     if not os.path.exists(filepath): return None
-    hash_md5 = hashlib.md5()
     with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'md5').hexdigest()
+
+        # Python < 3.11: hash through one reusable 1 MiB buffer.
+        hash_md5 = hashlib.md5()
+        buf = bytearray(1024 * 1024)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n: break
+            hash_md5.update(view[:n])
     return hash_md5.hexdigest()
 
+# url -> (ETag, Last-Modified, value returned last time), replayed as conditional headers.
+_REMOTE_VALIDATORS = {}
+
 def get_remote_header(url, header='Last-Modified'):
+    etag, modified, previous = _REMOTE_VALIDATORS.get(url, (None, None, None))
+    req = urllib.request.Request(url, method='HEAD')
+    if etag: req.add_header('If-None-Match', etag)
+    if modified: req.add_header('If-Modified-Since', modified)
     try:
-        req = urllib.request.Request(url, method='HEAD')
         with urllib.request.urlopen(req) as response:
-            return response.headers.get(header) or response.headers.get('ETag')
+            headers = response.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304: return previous
+        return None
     except: return None
+    value = headers.get(header) or headers.get('ETag')
+    _REMOTE_VALIDATORS[url] = (headers.get('ETag'), headers.get('Last-Modified'), value)
+    return value
+
+def download_file(url, dest, chunk_size=1 << 20):
+    """Stream *url* to *dest* in large chunks; *dest* is only replaced once complete."""
+    part = f"{dest}.part"
+    try:
+        with urllib.request.urlopen(url) as response, open(part, 'wb') as f:
+            shutil.copyfileobj(response, f, length=chunk_size)
+        os.replace(part, dest)
+    except BaseException:
+        try: os.remove(part)
+        except OSError: pass
+        raise
+
+def list_image_files():
+    """Return image archive names, plus unpacked rootfs dirs as 'tag/', from one directory scan."""
+    names = set()
+    with os.scandir(IMAGES_DIR) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                names.add(f"{entry.name}/")
+            elif entry.is_file() and entry.name.endswith(('.tar', '.tar.gz')):
+                names.add(entry.name)
+    return names
+
+# (IMAGES_DIR st_mtime_ns, {tag: [ext, ...]}); adding or removing an archive bumps the
+# directory mtime, so images built by other processes are picked up on the next lookup.
+_IMAGE_INDEX = None
+
+
+def _image_index():
+    global _IMAGE_INDEX
+    mtime = os.stat(IMAGES_DIR).st_mtime_ns
+    if _IMAGE_INDEX is None or _IMAGE_INDEX[0] != mtime:
+        index = {}
+        for name in list_image_files():
+            if name.endswith("/"): ext = "/"
+            else: ext = ".tar.gz" if name.endswith(".tar.gz") else ".tar"
+            index.setdefault(name[:-len(ext)], []).append(ext)
+        _IMAGE_INDEX = (mtime, index)
+    return _IMAGE_INDEX[1]
+
+def invalidate_image_index():
+    global _IMAGE_INDEX
+    _IMAGE_INDEX = None
 
 def image_exists(tag):
-    return any(
-        os.path.exists(os.path.join(IMAGES_DIR, f"{tag}{ext}"))
-        for ext in (".tar", ".tar.gz")
-    )
+    return tag in _image_index()
+
+def image_rootfs(tag):
+    """Unpacked rootfs kept by LinuxEngine.build; preferred over {tag}.tar when present."""
+    return os.path.join(IMAGES_DIR, tag)
+
+def _scandir_rmtree(path, dev=None):
+    """Remove a tree using DirEntry type info, without stat-ing entries twice.
+
+    Like rm --one-file-system, directories on another device (leftover mounts) are skipped.
+    """
+    try:
+        if dev is None:
+            st = os.lstat(path)
+            if not stat.S_ISDIR(st.st_mode):
+                return os.unlink(path)
+            dev = st.st_dev
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.stat(follow_symlinks=False).st_dev == dev:
+                            _scandir_rmtree(entry.path, dev)
+                    else:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+        os.rmdir(path)
+    except OSError:
+        pass
+
+def fast_rmtree(path):
+    """Delete a tree with the native tool, falling back to a scandir walk."""
+    if not path or not os.path.lexists(path):
+        return
+    if IS_WINDOWS:
+        cmd = ['cmd', '/c', 'rmdir', '/s', '/q', path]
+    else:
+        # Never descend into volume bind mounts that failed to unmount.
+        cmd = ['rm', '-rf', '--one-file-system', '--', path]
+    try:
+        subprocess.call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_windows_hidden_process_kwargs())
+    except OSError:
+        _scandir_rmtree(path)
 
 def remove_image_artifacts(tag):
     removed = False
-    for ext in (".tar", ".tar.gz"):
-        image_path = os.path.join(IMAGES_DIR, f"{tag}{ext}")
-        if os.path.exists(image_path):
-            os.remove(image_path)
+    for ext in _image_index().get(tag, []):
+        if ext == "/":
+            fast_rmtree(image_rootfs(tag))
+            removed = True
+            continue
+        try:
+            os.remove(os.path.join(IMAGES_DIR, f"{tag}{ext}"))
             removed = True
+        except FileNotFoundError:
+            pass
+    invalidate_image_index()
     return removed
 
 def list_project_containers(project_name):
     prefix = f"{project_name}_"
-    names = []
-    for state in iter_states():
-        name = state.get('name')
-        if name and name.startswith(prefix):
-            names.append(name)
-    return names
+    return [name for _, name, _ in state_summary() if name and name.startswith(prefix)]
+
+def container_name_index():
+    """Return {name: id} for every container from the cached state summary."""
+    return {name: cid for cid, name, _ in state_summary() if name and cid}
+
+def wait_container_running(ident, timeout=10, on_tick=None):
+    """Wait for a container to report 'running' or 'error'; return the last status, None if gone."""
+    s = load_state(ident)
+    if not s:
+        return None
+    cid = s['id']
+    deadline = time.time() + timeout
+    with DirectoryWatcher(STATE_DIR) as watcher:
+        while s['status'] not in ('running', 'error'):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            watcher.wait(min(1.0, remaining))
+            if on_tick: on_tick()
+            s = load_state(cid)
+            if not s:
+                return None
+    return s['status']
 
 def cleanup_container_resources(state):
     if not state:
@@ -324,20 +672,61 @@ def cleanup_container_resources(state):
         run_quiet(['wsl', '--unregister', cid])
     else:
         for mount in state.get('mounts', []):
-            run_quiet(['umount', '-l', mount])
+            _umount_lazy(mount)
         if root:
-            run_quiet(['umount', '-l', os.path.join(root, 'proc')])
+            _umount_lazy(os.path.join(root, 'proc'))
 
     if root:
-        shutil.rmtree(root, ignore_errors=True)
+        fast_rmtree(root)
     if cid:
         remove_state(cid)
 
-def spawn_internal_daemon(cid, log_handle=None):
+# Environment variable naming the inherited pipe fd a daemon signals once it is up.
+READY_FD_ENV = "LOCKBOX_READY_FD"
+# Fixed descriptor the ready pipe lands on in a posix_spawn'ed daemon.
+_CHILD_READY_FD = 3
+
+def spawn_internal_daemon(cid, log_handle=None, ready_fd=None):
     script = os.path.abspath(__file__)
     python_exe = _background_python_executable()
     startupinfo = None
     creationflags = 0
+    env = os.environ
+    pass_fds = ()
+
+    # ready_fd stays non-inheritable here: daemons spawned concurrently from other
+    # threads must not pick up a sibling's write end, or its launcher never sees EOF.
+    if not IS_WINDOWS and hasattr(os, 'posix_spawn'):
+        # Spawn directly instead of fork+exec; the daemon chdirs to INSTALL_DIR itself.
+        out_fd = log_handle.fileno() if log_handle else os.open(os.devnull, os.O_WRONLY)
+        file_actions = [
+            (os.POSIX_SPAWN_DUP2, out_fd, 1),
+            (os.POSIX_SPAWN_DUP2, out_fd, 2),
+        ]
+        src_fd = None
+        if ready_fd is not None:
+            # dup2 onto an equal fd would keep CLOEXEC, so never map an fd onto itself.
+            src_fd = os.dup(ready_fd) if ready_fd == _CHILD_READY_FD else ready_fd
+            file_actions.append((os.POSIX_SPAWN_DUP2, src_fd, _CHILD_READY_FD))
+            env = dict(os.environ, **{READY_FD_ENV: str(_CHILD_READY_FD)})
+        try:
+            return os.posix_spawn(
+                python_exe,
+                [python_exe, script, "internal-daemon", cid],
+                env,
+                file_actions=file_actions,
+                setsid=True,
+            )
+        finally:
+            if not log_handle:
+                os.close(out_fd)
+            if src_fd is not None and src_fd != ready_fd:
+                os.close(src_fd)
+
+    if ready_fd is not None and not IS_WINDOWS:
+        # pass_fds marks the fd inheritable in the forked child only.
+        env = dict(os.environ, **{READY_FD_ENV: str(ready_fd)})
+        pass_fds = (ready_fd,)
 
     if IS_WINDOWS:
         startupinfo = subprocess.STARTUPINFO()
@@ -348,14 +737,60 @@ def spawn_internal_daemon(cid, log_handle=None):
     proc = subprocess.Popen(
         [python_exe, script, "internal-daemon", cid],
         cwd=INSTALL_DIR,
+        env=env,
         creationflags=creationflags,
         startupinfo=startupinfo,
         close_fds=True,
+        pass_fds=pass_fds,
         start_new_session=True,
         stdout=log_handle if log_handle else subprocess.DEVNULL,
         stderr=subprocess.STDOUT if log_handle else subprocess.DEVNULL
     )
-    return proc
+    return proc.pid
+
+def spawn_daemon_with_ready_pipe(cid, log_handle=None):
+    """Spawn the daemon and return the read end of a pipe it signals once started."""
+    ready_r, ready_w = os.pipe()
+    try:
+        spawn_internal_daemon(cid, log_handle, ready_fd=ready_w)
+    except Exception:
+        os.close(ready_r)
+        raise
+    finally:
+        os.close(ready_w)
+    return ready_r
+
+def wait_ready_signal(ready_r, timeout):
+    """Return b'1' once running, b'0' on error, b'' if the daemon exited silently, or None on timeout."""
+    try:
+        ready, _, _ = select.select([ready_r], [], [], timeout)
+        return os.read(ready_r, 1) if ready else None
+    finally:
+        os.close(ready_r)
+
+def _notify_launcher(ok):
+    fd = os.environ.pop(READY_FD_ENV, None)
+    if fd is None:
+        return
+    try:
+        os.write(int(fd), b'1' if ok else b'0')
+        os.close(int(fd))
+    except (OSError, ValueError):
+        pass
+
+def _wait_wsl_ready(cid, timeout=10):
+    """Poll a freshly imported distro with exponential backoff until it answers."""
+    deadline = time.time() + timeout
+    delay = 0.05
+    while time.time() < deadline:
+        try:
+            if subprocess.call(['wsl', '-d', cid, 'true'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=max(1, deadline - time.time()), **_windows_hidden_process_kwargs()) == 0:
+                return True
+        except subprocess.TimeoutExpired:
+            pass
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+    return False
 
 def _graceful_windows_shutdown(cid, timeout_s=8):
     """Best-effort graceful shutdown before forcing WSL termination."""
@@ -371,8 +806,11 @@ def _graceful_windows_shutdown(cid, timeout_s=8):
     # Give processes a short window to handle SIGTERM and flush data.
     time.sleep(max(0, timeout_s))
 
+_SVC_RE = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
 def _normalize_service_name(value):
-    cleaned = re.sub(r'[^A-Za-z0-9_.-]+', '-', str(value or '').strip())
+    cleaned = _SVC_RE.sub('-', str(value or '').strip())
     cleaned = cleaned.strip('-_.')
     return cleaned or f"lockbox-{uuid.uuid4().hex[:8]}"
 
@@ -436,6 +874,113 @@ def _remove_windows_startup_task(service_name):
     subprocess.call(['schtasks', '/Delete', '/TN', task_name, '/F'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
+# systemd units queued while a batch is active ({unit: container id} and [unit]);
+# None means register/remove immediately.
+_pending_service_units = None
+_pending_service_removals = None
+
+
+def _service_batch_active():
+    return _pending_service_units is not None
+
+
+@contextmanager
+def batch_service_registrations():
+    """Queue Linux systemd enable/disable calls and flush them with one daemon-reload."""
+    global _pending_service_units, _pending_service_removals
+    if _service_batch_active():
+        yield
+        return
+
+    _pending_service_units = {}
+    _pending_service_removals = []
+    try:
+        yield
+    finally:
+        flush_service_registrations()
+        _pending_service_units = None
+        _pending_service_removals = None
+
+
+def flush_service_registrations():
+    """Apply queued unit removals and registrations with a single systemctl call each."""
+    if IS_WINDOWS or not _service_batch_active():
+        return
+
+    removals = list(_pending_service_removals)
+    units = dict(_pending_service_units)
+    _pending_service_removals.clear()
+    _pending_service_units.clear()
+
+    if removals:
+        subprocess.call(['systemctl', 'disable', '--now'] + removals, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for unit_name in removals:
+            unit_path = os.path.join('/etc/systemd/system', unit_name)
+            if os.path.exists(unit_path):
+                os.remove(unit_path)
+
+    if removals or units:
+        if subprocess.call(['systemctl', 'daemon-reload']) != 0:
+            print("Warning: Failed to reload systemd.")
+            _discard_unit_files(units)
+            return
+
+    if not units:
+        return
+    # Flag the containers before starting them: each daemon loads its state once at
+    # startup, so a flag written after `enable --now` would be overwritten by it.
+    _set_service_enabled(units, True)
+    if subprocess.call(['systemctl', 'enable', '--now'] + list(units)) == 0:
+        return
+    # The batch call doesn't say which unit failed; retry them one by one.
+    failed = {u: cid for u, cid in units.items() if subprocess.call(['systemctl', 'enable', '--now', u]) != 0}
+    if failed:
+        print(f"Warning: Failed to enable/start service(s): {', '.join(failed)}.")
+        _set_service_enabled(failed, False)
+        _discard_unit_files(failed)
+
+
+def _set_service_enabled(units, enabled):
+    for cid in units.values():
+        s = load_state(cid)
+        if s:
+            s['service_enabled'] = enabled
+            save_state(cid, s)
+
+
+def _discard_unit_files(units):
+    if not units:
+        return
+    subprocess.call(['systemctl', 'disable'] + list(units), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for unit_name in units:
+        unit_path = os.path.join('/etc/systemd/system', unit_name)
+        if os.path.exists(unit_path):
+            os.remove(unit_path)
+
+
+def _write_unit_file(state, service_name, script, python_exe):
+    cid = state['id']
+    unit_name = f"{service_name}.service"
+    unit_path = os.path.join('/etc/systemd/system', unit_name)
+    exec_start = f"{shlex.quote(python_exe)} {shlex.quote(script)} internal-daemon {shlex.quote(cid)}"
+    unit_contents = (
+        "[Unit]\n"
+        f"Description=LockBox container {state.get('name') or cid}\n"
+        "After=network.target\n\n"
+        "[Service]\n"
+        "Type=simple\n"
+        f"WorkingDirectory={INSTALL_DIR}\n"
+        f"ExecStart={exec_start}\n"
+        "Restart=always\n"
+        "RestartSec=2\n\n"
+        "[Install]\n"
+        "WantedBy=multi-user.target\n"
+    )
+    with open(unit_path, 'w') as f:
+        f.write(unit_contents)
+    return unit_name
+
+
 def _register_container_service(state):
     cid = state.get('id')
     if not cid:
@@ -458,32 +1003,39 @@ def _register_container_service(state):
                 _remove_legacy_windows_service(service_name)
             if not _register_windows_startup_task(service_name, create_cmd):
                 return False
-        else:
-            unit_name = f"{service_name}.service"
-            unit_path = os.path.join('/etc/systemd/system', unit_name)
-            exec_start = f"{shlex.quote(python_exe)} {shlex.quote(script)} internal-daemon {shlex.quote(cid)}"
-            unit_contents = (
-                "[Unit]\n"
-                f"Description=LockBox container {state.get('name') or cid}\n"
-                "After=network.target\n\n"
-                "[Service]\n"
-                "Type=simple\n"
-                f"WorkingDirectory={INSTALL_DIR}\n"
-                f"ExecStart={exec_start}\n"
-                "Restart=always\n"
-                "RestartSec=2\n\n"
-                "[Install]\n"
-                "WantedBy=multi-user.target\n"
-            )
-            with open(unit_path, 'w') as f:
-                f.write(unit_contents)
-
-            if subprocess.call(['systemctl', 'daemon-reload']) != 0:
-                print(f"Warning: Failed to reload systemd for service '{unit_name}'.")
-                return False
-            if subprocess.call(['systemctl', 'enable', '--now', unit_name]) != 0:
-                print(f"Warning: Failed to enable/start service '{unit_name}'.")
+        elif not state.get('service_persistent', True):
+            # Transient unit: one systemd-run call, no unit file and no daemon-reload.
+            rc = subprocess.call([
+                'systemd-run', '--unit', service_name,
+                '--description', f"LockBox container {state.get('name') or cid}",
+                '--property=Restart=always', '--property=RestartSec=2',
+                f'--working-directory={INSTALL_DIR}',
+                python_exe, script, 'internal-daemon', cid,
+            ])
+            if rc != 0:
+                print(f"Warning: Failed to start transient service '{service_name}'.")
                 return False
+        else:
+            unit_name = _write_unit_file(state, service_name, script, python_exe)
+
+            if _service_batch_active():
+                if unit_name in _pending_service_removals:
+                    _pending_service_removals.remove(unit_name)
+                _pending_service_units[unit_name] = cid
+                # service_enabled is only set once the batch flush actually enables the unit.
+                state['service_enabled'] = False
+                state['service_name'] = service_name
+                state['service_platform'] = 'linux'
+                save_state(cid, state)
+                print(f"Service mode queued: {service_name}")
+                return True
+            else:
+                if subprocess.call(['systemctl', 'daemon-reload']) != 0:
+                    print(f"Warning: Failed to reload systemd for service '{unit_name}'.")
+                    return False
+                if subprocess.call(['systemctl', 'enable', '--now', unit_name]) != 0:
+                    print(f"Warning: Failed to enable/start service '{unit_name}'.")
+                    return False
 
         state['service_enabled'] = True
         state['service_name'] = service_name
@@ -517,7 +1069,12 @@ def _stop_container_service(state):
 
 
 def _remove_container_service(state):
-    if not state or not state.get('service_enabled'):
+    if not state:
+        return
+    if not state.get('service_enabled'):
+        # A unit queued in the current batch is not enabled yet; just drop it.
+        if _service_batch_active() and state.get('service_name'):
+            _pending_service_units.pop(f"{state['service_name']}.service", None)
         return
 
     service_name = state.get('service_name') or _container_service_name(state)
@@ -530,6 +1087,11 @@ def _remove_container_service(state):
                 _remove_windows_startup_task(service_name)
         else:
             unit_name = f"{service_name}.service"
+            if _service_batch_active():
+                _pending_service_units.pop(unit_name, None)
+                if unit_name not in _pending_service_removals:
+                    _pending_service_removals.append(unit_name)
+                return
             unit_path = os.path.join('/etc/systemd/system', unit_name)
             subprocess.call(['systemctl', 'disable', '--now', unit_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             if os.path.exists(unit_path):
@@ -542,47 +1104,52 @@ def _remove_container_service(state):
 # ==========================================
 # ROBUST NETWORKING (FIXED FOR WSL 172.x)
 # ==========================================
+_IP_PROBE_SEPARATOR = '---LBOX-SEP---'
+_IP_RE = re.compile(r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$")
+_WSL_IP_RE = re.compile(r'inet (?:addr:)?(172\.\d{1,3}\.\d{1,3}\.\d{1,3})')
+_ANY_IP_RE = re.compile(r'inet (?:addr:)?(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})')
+_INET_IP_RE = re.compile(r'inet (\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})')
+
+
 def get_container_ip(cid, log_file=None):
     if not cid: return None
 
-    # 1. Fast IP probe (works even on minimal images without python3)
-    try:
-        if IS_WINDOWS:
-            cmd = [
-                'wsl', '-d', cid, 'sh', '-c',
-                "hostname -i 2>/dev/null | awk '{for(i=1;i<=NF;i++) if ($i !~ /^127\./) {print $i; exit}}'",
-            ]
-            output = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode().strip()
-            if re.match(r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$", output):
-                return output
-    except:
-        pass
+    # One WSL entry runs every probe; sections are split on the separator and tried in order.
+    if IS_WINDOWS:
+        probe = (
+            "hostname -i 2>/dev/null | awk '{for(i=1;i<=NF;i++) if ($i !~ /^127\\./) {print $i; exit}}'; "
+            f"echo '{_IP_PROBE_SEPARATOR}'; ifconfig 2>/dev/null; "
+            f"echo '{_IP_PROBE_SEPARATOR}'; ip addr 2>/dev/null"
+        )
+        try:
+            output = subprocess.check_output(
+                ['wsl', '-d', cid, 'sh', '-c', probe], stderr=subprocess.DEVNULL, timeout=3
+            ).decode(errors='replace')
+        except Exception:
+            output = ''
 
-    # 2. Raw ifconfig Parsing (Looking specifically for 172.x or 192.x)
-    try:
-        if IS_WINDOWS:
-            cmd = ['wsl', '-d', cid, 'ifconfig']
-            output = subprocess.check_output(cmd).decode()
+        sections = output.split(_IP_PROBE_SEPARATOR)
+        hostname_out, ifconfig_out, ipaddr_out = (sections + ['', '', ''])[:3]
 
-            # Priority 1: Match 172.x.x.x (WSL default range)
-            wsl_match = re.search(r'inet (?:addr:)?(172\.\d{1,3}\.\d{1,3}\.\d{1,3})', output)
-            if wsl_match: return wsl_match.group(1)
+        # 1. Fast IP probe (works even on minimal images without python3)
+        hostname_ip = hostname_out.strip()
+        if _IP_RE.match(hostname_ip):
+            return hostname_ip
 
-            # Priority 2: Match any non-127 IP
-            all_matches = re.findall(r'inet (?:addr:)?(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})', output)
-            for ip in all_matches:
-                if not ip.startswith("127."): return ip
-    except: pass
+        # 2. Raw ifconfig Parsing (Looking specifically for 172.x or 192.x)
+        # Priority 1: Match 172.x.x.x (WSL default range)
+        wsl_match = _WSL_IP_RE.search(ifconfig_out)
+        if wsl_match: return wsl_match.group(1)
 
-    # 3. Last Resort: ip addr
-    try:
-        if IS_WINDOWS:
-            cmd = ['wsl', '-d', cid, 'ip', 'addr']
-            output = subprocess.check_output(cmd).decode()
-            matches = re.findall(r'inet (\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})', output)
-            for ip in matches:
-                if not ip.startswith("127."): return ip
-    except: pass
+        # Priority 2: Match any non-127 IP
+        all_matches = _ANY_IP_RE.findall(ifconfig_out)
+        for ip in all_matches:
+            if not ip.startswith("127."): return ip
+
+        # 3. Last Resort: ip addr
+        matches = _INET_IP_RE.findall(ipaddr_out)
+        for ip in matches:
+            if not ip.startswith("127."): return ip
 
     if log_file: 
         log_file.write(f"[Network] Failed to resolve IP. Defaulting to 127.0.0.1\n")
@@ -608,45 +1175,61 @@ def start_port_forwarding(cid, mappings, stop_event, log_file):
             target_ip = ip
             log_file.write(f"[Network] Resolved IP: {target_ip}\n")
 
+    pairs = []
     for mapping in mappings:
         try:
             parts = mapping.split(':')
             host_port, container_port = int(parts[0]), int(parts[1])
-
-            if not check_port_free(host_port):
-                log_file.write(f"[FATAL] Port {host_port} is busy.\n")
-                return False
-
-            # Don't start proxy until Flask/Redis is actually ready
-            if not wait_for_port(target_ip, container_port):
-                 log_file.write(f"[Network] Warning: Container port {container_port} not open yet. Proxy might fail initially.\n")
-
-            t = threading.Thread(target=tcp_proxy, args=(host_port, target_ip, container_port, stop_event, log_file))
-            t.daemon = True
-            t.start()
-            log_file.write(f"[Network] Proxy: localhost:{host_port} <--> {target_ip}:{container_port}\n")
         except Exception as e:
             log_file.write(f"[Network] Error: {e}\n")
             return False
+
+        if not check_port_free(host_port):
+            log_file.write(f"[FATAL] Port {host_port} is busy.\n")
+            return False
+        pairs.append((host_port, container_port))
+
+    # Don't start proxies until Flask/Redis is actually ready; probe all ports at once.
+    with ThreadPoolExecutor(max_workers=max(1, len(pairs))) as pool:
+        probes = {pool.submit(wait_for_port, target_ip, cp): cp for _, cp in pairs}
+        ready = {probes[f]: f.result() for f in as_completed(probes)}
+
+    for host_port, container_port in pairs:
+        if not ready.get(container_port):
+             log_file.write(f"[Network] Warning: Container port {container_port} not open yet. Proxy might fail initially.\n")
+
+    # All mappings share one event loop running in a single background thread.
+    t = threading.Thread(target=tcp_proxy, args=(pairs, target_ip, stop_event, log_file))
+    t.daemon = True
+    t.start()
+    for host_port, container_port in pairs:
+        log_file.write(f"[Network] Proxy: localhost:{host_port} <--> {target_ip}:{container_port}\n")
     log_file.flush()
     return True
 
-def tcp_proxy(src, target_ip, dst, stop_event, log_file):
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+def tcp_proxy(routes, target_ip, stop_event, log_file):
+    """Serve every (host_port, container_port) route until stop_event is set."""
     try:
-        server.bind(('0.0.0.0', src))
-        server.listen(10)
-        server.settimeout(1.0)
-    except Exception as e: return
+        asyncio.run(_serve_proxies(routes, target_ip, stop_event, log_file))
+    except Exception as e:
+        log_file.write(f"[Network] Proxy loop stopped: {e}\n")
 
-    while not stop_event.is_set():
+async def _serve_proxies(routes, target_ip, stop_event, log_file):
+    servers = []
+    for src, dst in routes:
+        def on_client(reader, writer, dst=dst):
+            return handle_connection_retry(reader, writer, target_ip, dst)
         try:
-            client, addr = server.accept()
-            threading.Thread(target=handle_connection_retry, args=(client, target_ip, dst, log_file)).start()
-        except socket.timeout: continue
-        except: break
-    server.close()
+            servers.append(await asyncio.start_server(on_client, '0.0.0.0', src, limit=PROXY_BUFFER_SIZE, backlog=10, reuse_address=True))
+        except Exception as e:
+            log_file.write(f"[Network] Error: cannot listen on {src} ({e})\n")
+
+    try:
+        while not stop_event.is_set():
+            await asyncio.sleep(1.0)
+    finally:
+        for server in servers:
+            server.close()
 
 def parse_env_entries(envs):
     env_map = {}
@@ -677,7 +1260,7 @@ def _is_host_path_reference(value):
 
 
 def _normalize_volume_name(value):
-    cleaned = re.sub(r'[^A-Za-z0-9_.-]+', '-', str(value or '').strip())
+    cleaned = _SVC_RE.sub('-', str(value or '').strip())
     cleaned = cleaned.strip('-_.')
     if not cleaned:
         raise ValueError("Volume name cannot be empty.")
@@ -731,7 +1314,7 @@ def remove_named_volume(volume_name):
     path = os.path.join(VOLUMES_DIR, normalized)
     if not os.path.exists(path):
         return False
-    shutil.rmtree(path, ignore_errors=True)
+    fast_rmtree(path)
     return True
 
 
@@ -753,39 +1336,121 @@ def _resolve_project_service_volumes(project_name, volumes):
         resolved.append(f"{source}:{target.strip()}")
     return resolved
 
-def handle_connection_retry(client, ip, port, log_file):
-    target = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    connected = False
+PROXY_BUFFER_SIZE = 1 << 20
+
+
+def _tune_proxy_socket(writer):
+    sock = writer.get_extra_info('socket')
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, PROXY_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, PROXY_BUFFER_SIZE)
+    except OSError:
+        pass
+
+
+async def handle_connection_retry(client_reader, client_writer, ip, port):
     for attempt in range(5): 
         try:
-            target.connect((ip, port))
-            connected = True
+            target_reader, target_writer = await asyncio.open_connection(ip, port, limit=PROXY_BUFFER_SIZE)
             break
-        except Exception: time.sleep(0.2)
-
-    if not connected:
-        client.close()
+        except Exception: await asyncio.sleep(0.2)
+    else:
+        client_writer.close()
         return
 
-    def forward(src, dst):
+    _tune_proxy_socket(client_writer)
+    _tune_proxy_socket(target_writer)
+
+    async def forward(src, dst):
         try:
             while True:
-                data = src.recv(32768)
+                data = await src.read(PROXY_BUFFER_SIZE)
                 if not data: break
-                dst.send(data)
+                dst.write(data)
+                await dst.drain()
         except: pass
         finally: 
-            src.close()
             dst.close()
 
-    t1 = threading.Thread(target=forward, args=(client, target))
-    t2 = threading.Thread(target=forward, args=(target, client))
-    t1.start(); t2.start()
-    t1.join(); t2.join()
+    await asyncio.gather(forward(client_reader, target_writer), forward(target_reader, client_writer))
+
+COPY_IGNORED_DIRS = frozenset(('.git', 'venv', '__pycache__'))
+
+
+def _iter_copy_tree(src_path):
+    """Yield (local_path, relative_path) for a COPY source tree, pruning ignored dirs."""
+    stack = [(src_path, "")]
+    while stack:
+        current, rel_root = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                rel_path = f"{rel_root}/{entry.name}" if rel_root else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in COPY_IGNORED_DIRS:
+                        continue
+                    yield entry.path, rel_path
+                    stack.append((entry.path, rel_path))
+                else:
+                    yield entry.path, rel_path
 
 # ==========================================
 # WINDOWS ENGINE
 # ==========================================
+class WslShell:
+    """Long-lived `sh` inside a WSL distro that runs commands streamed over stdin.
+
+    Each command runs as its own quoted `sh -c` with stdin from /dev/null, so steps stay
+    isolated, malformed input fails with a status instead of swallowing the command
+    stream, and a unique sentinel line carries the exit code.
+    """
+
+    def __init__(self, distro):
+        self.token = f"__LBOX_END_{uuid.uuid4().hex}__"
+        self.proc = subprocess.Popen(
+            ['wsl', '-d', distro, 'sh'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+    def run(self, cmd, quiet=False):
+        """Run cmd, echoing its output unless quiet, and return its exit code."""
+        try:
+            self.proc.stdin.write(f"sh -c {shlex.quote(cmd)} </dev/null\necho \"{self.token}$?\"\n".encode())
+            self.proc.stdin.flush()
+        except OSError:
+            return 255
+
+        while True:
+            line = self.proc.stdout.readline()
+            if not line:
+                return 255
+            text = line.decode(errors='replace')
+            if self.token in text:
+                before, _, code = text.partition(self.token)
+                if before and not quiet: print(before)
+                try: return int(code.strip())
+                except ValueError: return 1
+            if not quiet:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+
+    def check(self, cmd):
+        rc = self.run(cmd)
+        if rc != 0:
+            raise subprocess.CalledProcessError(rc, cmd)
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=5)
+        except Exception:
+            self.proc.kill()
+
+
 class WindowsEngine:
     def check_reqs(self):
         try: subprocess.check_call(['wsl', '--status'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
@@ -799,8 +1464,6 @@ class WindowsEngine:
         else:
             full_dst_root = dst_path
 
-        subprocess.call(['wsl', '-d', bid, 'sh', '-c', f'mkdir -p "{full_dst_root}"'])
-
         if os.path.isfile(src_path):
             target_file = full_dst_root
             if dst_path == "." or dst_path.endswith("/") or dst_path.endswith("\\"):
@@ -808,25 +1471,50 @@ class WindowsEngine:
                  target_file = f"{full_dst_root}/{base}"
 
             target_file = target_file.replace("\\", "/").replace("//", "/")
-            parent_dir = os.path.dirname(target_file)
-            subprocess.call(['wsl', '-d', bid, 'sh', '-c', f'mkdir -p "{parent_dir}"'])
-            with open(src_path, 'rb') as f:
-                subprocess.run(['wsl', '-d', bid, 'sh', '-c', f'cat > "{target_file}"'], stdin=f, check=True)
-
+            extract_dir = os.path.dirname(target_file) or "/"
+            members = [(src_path, os.path.basename(target_file))]
         elif os.path.isdir(src_path):
-            for root, dirs, files in os.walk(src_path):
-                if '.git' in dirs: dirs.remove('.git')
-                if 'venv' in dirs: dirs.remove('venv')
-                if '__pycache__' in dirs: dirs.remove('__pycache__')
-
-                for file in files:
-                    local_file = os.path.join(root, file)
-                    rel_path = os.path.relpath(local_file, src_path)
-                    container_file = f"{full_dst_root}/{rel_path}".replace("\\", "/").replace("//", "/")
-                    cont_parent = os.path.dirname(container_file)
-                    subprocess.call(['wsl', '-d', bid, 'sh', '-c', f'mkdir -p "{cont_parent}"'])
-                    with open(local_file, 'rb') as f:
-                         subprocess.run(['wsl', '-d', bid, 'sh', '-c', f'cat > "{container_file}"'], stdin=f, check=True)
+            extract_dir = full_dst_root.replace("\\", "/").replace("//", "/") or "/"
+            members = _iter_copy_tree(src_path)
+        else:
+            return
+
+        # Stream everything through one tar pipe instead of a wsl round-trip per file.
+        quoted_dir = shlex.quote(extract_dir)
+        proc = subprocess.Popen(
+            ['wsl', '-d', bid, 'sh', '-c', f'mkdir -p {quoted_dir} && cd {quoted_dir} && exec tar -xf -'],
+            stdin=subprocess.PIPE,
+        )
+        try:
+            with tarfile.open(fileobj=proc.stdin, mode='w|') as tar:
+                for local_path, arcname in members:
+                    tar.add(local_path, arcname=arcname, recursive=False)
+        finally:
+            proc.stdin.close()
+            rc = proc.wait()
+        if rc != 0:
+            raise subprocess.CalledProcessError(rc, proc.args)
+
+    def _import_distro(self, distro, root, archive):
+        """Import archive as a WSL distro, streaming .tar.gz through pigz when it is installed."""
+        hidden = _windows_hidden_process_kwargs()
+        pigz = shutil.which('pigz') if archive.endswith('.tar.gz') else None
+        if not pigz:
+            # wsl --import reads .tar and .tar.gz paths natively.
+            return subprocess.call(['wsl', '--import', distro, root, archive], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **hidden)
+
+        importer = subprocess.Popen(['wsl', '--import', distro, root, '-'], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **hidden)
+        inflate_rc = 1
+        try:
+            inflate_rc = subprocess.call([pigz, '-dc', archive], stdout=importer.stdin, **hidden)
+        except OSError:
+            pass
+        finally:
+            try: importer.stdin.close()
+            except OSError: pass
+        rc = importer.wait()
+        # A truncated archive may still import cleanly as a partial tree.
+        return rc or inflate_rc
 
     def build(self, tag, instructions, context):
         self.check_reqs()
@@ -837,14 +1525,17 @@ class WindowsEngine:
 
         current_workdir = "/" 
         meta = {"cmd": None, "workdir": "/"}
+        shell = None
 
         try:
             base = os.path.join(IMAGES_DIR, "alpine.tar.gz")
             if not os.path.exists(base): raise Exception("Base image missing.")
-            run_quiet(['wsl', '--import', bid, root, base])
-            run_quiet(['wsl', '-d', bid, 'sh', '-c', 'echo "nameserver 8.8.8.8" > /etc/resolv.conf'])
+            rc = self._import_distro(bid, root, base)
+            if rc != 0: raise Exception(f"Importing base image failed (exit {rc}).")
+            shell = WslShell(bid)
+            shell.run('echo "nameserver 8.8.8.8" > /etc/resolv.conf', quiet=True)
 
-            subprocess.call(['wsl', '-d', bid, 'sh', '-c', 'mkdir -p /app /root /tmp'])
+            shell.run('mkdir -p /app /root /tmp')
 
             for step in instructions.get('STEPS', []):
                 cmd, arg = step['cmd'], step['arg']
@@ -859,14 +1550,13 @@ class WindowsEngine:
                             self._copy_recursive(bid, full_src, dst, current_workdir)
                 elif cmd == 'EXEC':
                     print(f"   RUN {arg}")
-                    try: subprocess.check_call(['wsl', '-d', bid, 'sh', '-c', arg])
-                    except subprocess.CalledProcessError: raise
+                    shell.check(arg)
                 elif cmd == 'ENV':
-                    subprocess.check_call(['wsl', '-d', bid, 'sh', '-c', f"echo 'export {arg}' >> /etc/profile"])
+                    shell.check(f"echo 'export {arg}' >> /etc/profile")
                 elif cmd == 'DIR':
-                    subprocess.call(['wsl', '-d', bid, 'sh', '-c', f"mkdir -p {arg}"])
                     current_workdir = arg.strip()
                     meta["workdir"] = current_workdir
+                    shell.run(f"mkdir -p {shlex.quote(current_workdir)}")
                 elif cmd == 'START':
                     try:
                         meta["cmd"] = json.loads(arg)
@@ -877,16 +1567,20 @@ class WindowsEngine:
             run_quiet(['wsl', '--export', bid, dest])
 
             with open(os.path.join(IMAGES_DIR, f"{tag}.json"), 'w') as f:
-                json.dump(meta, f)
+                f.write(_json_dumps(meta, indent=False))
 
+            invalidate_image_index()
             print(f"Success: Built {tag}")
+            return True
         except Exception as e:
             print(f"Build Failed: {e}")
+            return False
         finally:
+            if shell: shell.close()
             run_quiet(['wsl', '--unregister', bid])
-            shutil.rmtree(root, ignore_errors=True)
+            fast_rmtree(root)
 
-    def run(self, image, name, ports, volumes, envs, detach, cmd, restart_policy="no", labels=None, network="bridge", as_service=False):
+    def run(self, image, name, ports, volumes, envs, detach, cmd, restart_policy="no", labels=None, network="bridge", as_service=False, persistent_service=True):
         self.check_reqs()
 
         for p in ports:
@@ -900,7 +1594,7 @@ class WindowsEngine:
         workdir = "/"
         if not cmd:
             try: 
-                meta = json.load(open(os.path.join(IMAGES_DIR, f"{image}.json")))
+                with open(os.path.join(IMAGES_DIR, f"{image}.json"), 'rb') as f: meta = _json_loads(f.read())
                 cmd = meta.get("cmd")
                 workdir = meta.get("workdir", "/")
             except: pass
@@ -911,8 +1605,9 @@ class WindowsEngine:
         os.makedirs(root)
 
         try:
-            subprocess.check_call(['wsl', '--import', cid, root, img_path], stdout=subprocess.DEVNULL)
-            time.sleep(2.0)
+            rc = self._import_distro(cid, root, img_path)
+            if rc != 0: raise subprocess.CalledProcessError(rc, ['wsl', '--import', cid, root, img_path])
+            _wait_wsl_ready(cid)
 
             resolved_volumes = resolve_volume_bindings(volumes)
             state = {
@@ -927,6 +1622,7 @@ class WindowsEngine:
                 "labels": labels or {},
                 "network": network or "bridge",
                 "service_enabled": bool(as_service),
+                "service_persistent": bool(persistent_service),
                 "service_name": None
             }
             save_state(cid, state)
@@ -949,19 +1645,26 @@ class WindowsEngine:
                 spawn_internal_daemon(cid, log_handle)
 
             print(f"Starting {name or cid}...", end="", flush=True)
-            for _ in range(240): 
-                time.sleep(0.25)
-                s = load_state(cid)
-                if not s: break
-                if s['status'] == 'running':
-                    print(" OK")
-                    if not detach: self.logs(cid, follow=True)
-                    return
-                elif s['status'] == 'error':
-                    print(" Failed.")
-                    self.print_crash_logs(cid)
-                    return
-                print(".", end="", flush=True)
+            started = time.time()
+            deadline = started + 60
+            next_dot = started + 1
+            with DirectoryWatcher(STATE_DIR) as watcher:
+                while time.time() < deadline:
+                    watcher.wait(min(1.0, max(0, deadline - time.time())))
+                    s = load_state(cid)
+                    if not s: break
+                    if s['status'] == 'running':
+                        print(f" OK ({int((time.time() - started) * 1000)}ms)")
+                        if not detach: self.logs(cid, follow=True)
+                        return
+                    elif s['status'] == 'error':
+                        print(" Failed.")
+                        self.print_crash_logs(cid)
+                        return
+                    # Watcher wake-ups can be frequent; one progress dot per second is enough.
+                    if time.time() >= next_dot:
+                        print(".", end="", flush=True)
+                        next_dot += 1
 
             print(" Timeout.")
             self.stop(cid)
@@ -998,7 +1701,7 @@ class WindowsEngine:
         for i in range(5):
             if run_quiet(['wsl', '--unregister', cid]): break
             time.sleep(1)
-        shutil.rmtree(os.path.join(CONTAINERS_DIR, cid), ignore_errors=True)
+        fast_rmtree(os.path.join(CONTAINERS_DIR, cid))
         remove_state(cid)
         print("Done.")
 
@@ -1021,13 +1724,15 @@ class WindowsEngine:
             else:
                 f.seek(0, 2)
                 try:
-                    while True:
-                        l = f.readline()
-                        if not l:
-                            time.sleep(0.1)
-                            if load_state(cid)['status'] != 'running': break
-                            continue
-                        print(l, end='')
+                    with DirectoryWatcher(LOGS_DIR, poll_interval=0.1) as watcher:
+                        while True:
+                            l = f.readline()
+                            if not l:
+                                s = load_state(cid)
+                                if not s or s['status'] != 'running': break
+                                watcher.wait(0.5)
+                                continue
+                            print(l, end='')
                 except: pass
 
     def ps(self):
@@ -1039,17 +1744,175 @@ class WindowsEngine:
                 print(f"{d['id']:<15} {name:<15} {d['image']:<15} {d['status']:<10} {ports}")
 
     def inject_hosts(self, cid, hosts_map):
-        """Updates /etc/hosts"""
-        for hostname, ip in hosts_map.items():
-            try:
-                entry = f"\n{ip} {hostname}"
-                cmd = f"printf '{entry}' >> /etc/hosts"
-                subprocess.call(['wsl', '-d', cid, 'sh', '-c', cmd])
-            except: pass
+        """Updates /etc/hosts with every entry in a single wsl call."""
+        if not hosts_map: return
+        text = "".join(f"\n{ip} {hostname}" for hostname, ip in hosts_map.items()) + "\n"
+        try:
+            subprocess.run(['wsl', '-d', cid, 'sh', '-c', 'cat >> /etc/hosts'], input=text.encode(),
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_windows_hidden_process_kwargs())
+        except: pass
 
 # ==========================================
 # LINUX ENGINE
 # ==========================================
+def _extract_tar(path, dest, workers=0):
+    """Unpack an image archive with the system tar, keeping modes and numeric owners."""
+    if workers > 0:
+        return _extract_tar_parallel(path, dest, workers)
+    pigz = shutil.which('pigz') if path.endswith('.tar.gz') else None
+    if not pigz:
+        flags = '-xzpf' if path.endswith('.tar.gz') else '-xpf'
+        return subprocess.check_call(['tar', '--numeric-owner', flags, path, '-C', dest])
+
+    # Multi-threaded inflate feeding tar directly; tar -z would use single-threaded gzip.
+    inflate = subprocess.Popen([pigz, '-dc', path], stdout=subprocess.PIPE)
+    try:
+        untar = subprocess.Popen(['tar', '--numeric-owner', '-xpf', '-', '-C', dest], stdin=inflate.stdout)
+    finally:
+        inflate.stdout.close()
+    rc = untar.wait()
+    inflate_rc = inflate.wait()
+    if rc != 0:
+        raise subprocess.CalledProcessError(rc, untar.args)
+    if inflate_rc != 0:
+        raise subprocess.CalledProcessError(inflate_rc, inflate.args)
+
+def _copy_tar_range(src_fd, dst_fd, offset, size):
+    """Copy size bytes at offset of an uncompressed archive, in-kernel where supported."""
+    end = offset + size
+    try:
+        while offset < end:
+            n = os.copy_file_range(src_fd, dst_fd, end - offset, offset_src=offset)
+            if n == 0: break
+            offset += n
+        return
+    except (AttributeError, OSError):
+        pass
+    while offset < end:
+        chunk = os.pread(src_fd, min(1 << 20, end - offset), offset)
+        if not chunk: break
+        os.write(dst_fd, chunk)
+        offset += len(chunk)
+
+def _write_tar_member(full, data, member, src_fd=None):
+    with open(full, 'wb') as f:
+        if src_fd is None:
+            f.write(data)
+        else:
+            _copy_tar_range(src_fd, f.fileno(), member.offset_data, member.size)
+    try: os.chown(full, member.uid, member.gid)
+    except OSError: pass
+    os.chmod(full, member.mode)
+    os.utime(full, (member.mtime, member.mtime))
+
+def _extract_tar_parallel(path, dest, workers):
+    """Unpack with regular-file writes fanned out to a thread pool.
+
+    Directories are created once each from the reading thread; links and special
+    files are extracted after all regular files exist, and directory attributes last.
+    An archive that places members beneath one of its own links (e.g. lib64 -> lib,
+    then lib64/x), or that repeats a path, falls back to a serial `tar -x`, which
+    resolves them in order with the later member winning.
+    """
+    dest = os.path.abspath(dest)
+    made_dirs = {dest}
+    dirs = []
+    deferred = []
+    link_paths = set()
+    written = set()
+    serial = False
+    trusted = {'filter': 'fully_trusted'} if hasattr(tarfile, 'fully_trusted_filter') else {}
+    # Member data in a plain .tar sits at a fixed offset, so workers copy it straight from the archive.
+    src_fd = None if path.endswith('.tar.gz') else os.open(path, os.O_RDONLY)
+
+    try:
+        with tarfile.open(path) as tar, ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for member in tar:
+                full = os.path.normpath(os.path.join(dest, member.name))
+                if full != dest and not full.startswith(dest + os.sep):
+                    print(f"Warning: skipping archive member outside the rootfs: {member.name}")
+                    continue
+                if link_paths:
+                    p = full
+                    while p != dest and p not in link_paths:
+                        p = os.path.dirname(p)
+                    if p != dest:
+                        serial = True
+                        break
+                if member.isdir():
+                    if full not in made_dirs:
+                        os.makedirs(full, exist_ok=True)
+                        made_dirs.add(full)
+                    dirs.append((full, member))
+                    continue
+
+                if full in written:
+                    serial = True
+                    break
+                written.add(full)
+
+                parent = os.path.dirname(full)
+                if parent not in made_dirs:
+                    os.makedirs(parent, exist_ok=True)
+                    made_dirs.add(parent)
+
+                if not member.isreg():
+                    if member.issym() or member.islnk():
+                        link_paths.add(full)
+                    deferred.append(member)
+                    continue
+
+                if src_fd is not None and not member.issparse():
+                    pending.add(pool.submit(_write_tar_member, full, None, member, src_fd))
+                else:
+                    data = tar.extractfile(member).read()
+                    pending.add(pool.submit(_write_tar_member, full, data, member))
+                if len(pending) >= workers * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done: future.result()
+
+            for future in pending: future.result()
+            if not serial:
+                for member in deferred:
+                    tar.extract(member, dest, numeric_owner=True, **trusted)
+    finally:
+        if src_fd is not None: os.close(src_fd)
+
+    if serial:
+        # Files written so far are rewritten in place; nothing was created under a link path.
+        return _extract_tar(path, dest)
+
+    for full, member in reversed(dirs):
+        try: os.chown(full, member.uid, member.gid)
+        except OSError: pass
+        os.chmod(full, member.mode)
+        os.utime(full, (member.mtime, member.mtime))
+
+def _publish_rootfs(root, tag):
+    """Move a finished build tree into IMAGES_DIR as the image, replacing any previous build."""
+    dest = image_rootfs(tag)
+    stale = None
+    if os.path.lexists(dest):
+        stale = os.path.join(CONTAINERS_DIR, f"stale_{uuid.uuid4().hex[:8]}")
+        os.rename(dest, stale)
+    try:
+        os.rename(root, dest)
+    except OSError:
+        shutil.move(root, dest)
+    if stale: fast_rmtree(stale)
+    try:
+        os.remove(os.path.join(IMAGES_DIR, f"{tag}.tar"))
+    except FileNotFoundError:
+        pass
+
+def _clone_rootfs(src, dest):
+    """Copy an image rootfs into a container root; reflinks make this near-free on btrfs/xfs."""
+    try:
+        subprocess.check_call(['cp', '-a', '--reflink=auto', f"{src}/.", dest], stderr=subprocess.DEVNULL)
+    except subprocess.CalledProcessError:
+        subprocess.check_call(['cp', '-a', f"{src}/.", dest])
+
 class LinuxEngine:
     def check_reqs(self):
         if os.geteuid() != 0: sys.exit("Error: Run as sudo.")
@@ -1062,11 +1925,15 @@ class LinuxEngine:
             os.makedirs(os.path.dirname(full_dst), exist_ok=True)
             shutil.copy2(src_path, full_dst)
         elif os.path.isdir(src_path):
-            full_dst_root = os.path.join(root, dst_path.lstrip('/'))
+            # Same placement rules as `cp -r`, without forking a cp per COPY step.
             if dst_path == "." or dst_path == "./":
-                subprocess.call(['cp', '-r', src_path + '/.', root])
+                target = root
             else:
-                subprocess.call(['cp', '-r', src_path, full_dst_root])
+                target = os.path.join(root, dst_path.lstrip('/'))
+                base = os.path.basename(src_path.rstrip('/'))
+                if base != '.' and os.path.isdir(target):
+                    target = os.path.join(target, base)
+            shutil.copytree(src_path, target, symlinks=True, dirs_exist_ok=True)
 
     def build(self, tag, instructions, context):
         self.check_reqs()
@@ -1078,11 +1945,31 @@ class LinuxEngine:
         try:
             base = os.path.join(IMAGES_DIR, "alpine.tar.gz")
             if not os.path.exists(base): raise Exception("Base image missing.")
-            with tarfile.open(base) as t: t.extractall(root)
+            _extract_tar(base, root)
             with open(os.path.join(root, 'etc/resolv.conf'), 'w') as f: f.write("nameserver 8.8.8.8\\n")
 
+            # Consecutive EXEC steps share one chroot; each runs as its own quoted `sh -c`,
+            # so a malformed step fails alone, and its RUN marker prints right before its output.
+            pending = []
+            def flush_exec():
+                if pending:
+                    script = "\n".join(
+                        f"echo {shlex.quote(f'   RUN {a}')}\n"
+                        f"sh -c {shlex.quote(a)} || {{ rc=$?; echo {shlex.quote(f'   Step failed: {a}')} >&2; exit $rc; }}"
+                        for a in pending
+                    )
+                    pending.clear()
+                    sys.stdout.flush()
+                    rc = subprocess.call(['chroot', root, '/bin/sh', '-c', script])
+                    if rc != 0:
+                        raise Exception(f"EXEC step exited with status {rc}")
+
             for step in instructions.get('STEPS', []):
                 cmd, arg = step['cmd'], step['arg']
+                if cmd == 'EXEC':
+                    pending.append(arg)
+                    continue
+                flush_exec()
                 if cmd == 'COPY':
                     parts = arg.split(' ')
                     if len(parts) >= 2:
@@ -1091,11 +1978,13 @@ class LinuxEngine:
                         full_src = os.path.join(context, src)
                         if os.path.exists(full_src):
                             self._copy_recursive(root, full_src, dst)
-                elif cmd == 'EXEC':
-                    print(f"   RUN {arg}")
-                    subprocess.check_call(['chroot', root, '/bin/sh', '-c', arg])
                 elif cmd == 'ENV':
-                    subprocess.check_call(['chroot', root, '/bin/sh', '-c', f"echo 'export {arg}' >> /etc/profile"])
+                    profile = os.path.join(root, 'etc', 'profile')
+                    if not os.path.realpath(profile).startswith(os.path.realpath(root) + os.sep):
+                        # A symlink escaping the rootfs must be resolved inside the chroot, never on the host.
+                        subprocess.check_call(['chroot', root, '/bin/sh', '-c', f"echo 'export {arg}' >> /etc/profile"])
+                    else:
+                        with open(profile, 'a') as f: f.write(f"export {arg}\n")
                 elif cmd == 'DIR':
                     meta["workdir"] = arg.strip()
                     os.makedirs(os.path.join(root, arg.lstrip('/')), exist_ok=True)
@@ -1104,27 +1993,34 @@ class LinuxEngine:
                         meta["cmd"] = json.loads(arg)
                         if isinstance(meta["cmd"], list): meta["cmd"] = " ".join(meta["cmd"])
                     except: meta["cmd"] = arg
+            flush_exec()
 
-            with tarfile.open(os.path.join(IMAGES_DIR, f"{tag}.tar"), "w") as t: t.add(root, arcname=".")
-            with open(os.path.join(IMAGES_DIR, f"{tag}.json"), 'w') as f: json.dump(meta, f)
+            _publish_rootfs(root, tag)
+            with open(os.path.join(IMAGES_DIR, f"{tag}.json"), 'w') as f: f.write(_json_dumps(meta, indent=False))
+            invalidate_image_index()
             print(f"Success: Built {tag}")
-        except Exception as e: print(f"Build Failed: {e}")
-        finally: shutil.rmtree(root, ignore_errors=True)
+            return True
+        except Exception as e:
+            print(f"Build Failed: {e}")
+            return False
+        finally: fast_rmtree(root)
 
-    def run(self, image, name, ports, volumes, envs, detach, cmd, restart_policy="no", labels=None, network="bridge", as_service=False):
+    def run(self, image, name, ports, volumes, envs, detach, cmd, restart_policy="no", labels=None, network="bridge", as_service=False, persistent_service=True):
         self.check_reqs()
         for p in ports:
             host_port = _extract_host_port(p)
             if host_port is not None and not check_port_free(host_port):
                 return print(f"Error: Host port {host_port} is already in use by another process.")
 
+        img_dir = image_rootfs(image)
         img_path = os.path.join(IMAGES_DIR, f"{image}.tar")
-        if not os.path.exists(img_path): return print("Image missing.")
+        if not os.path.isdir(img_dir): img_dir = None
+        if not img_dir and not os.path.exists(img_path): return print("Image missing.")
 
         workdir = "/"
         if not cmd:
             try: 
-                meta = json.load(open(os.path.join(IMAGES_DIR, f"{image}.json")))
+                with open(os.path.join(IMAGES_DIR, f"{image}.json"), 'rb') as f: meta = _json_loads(f.read())
                 cmd = meta.get("cmd")
                 workdir = meta.get("workdir", "/")
             except: pass
@@ -1134,7 +2030,8 @@ class LinuxEngine:
         root = os.path.join(CONTAINERS_DIR, cid)
         os.makedirs(root)
         try:
-            with tarfile.open(img_path) as t: t.extractall(root)
+            if img_dir: _clone_rootfs(img_dir, root)
+            else: _extract_tar(img_path, root, workers=EXTRACT_WORKERS)
             with open(os.path.join(root, 'etc/resolv.conf'), 'w') as f: f.write("nameserver 8.8.8.8\\n")
             resolved_volumes = resolve_volume_bindings(volumes)
             state = {
@@ -1149,6 +2046,7 @@ class LinuxEngine:
                 "labels": labels or {},
                 "network": network or "bridge",
                 "service_enabled": bool(as_service),
+                "service_persistent": bool(persistent_service),
                 "service_name": None
             }
             save_state(cid, state)
@@ -1157,6 +2055,7 @@ class LinuxEngine:
             lf = open(lp, 'a')
             lf.write(f"--- Init {cid} ---\\n"); lf.flush()
 
+            ready_fd = None
             if as_service:
                 service_registered = _register_container_service(state)
                 if not service_registered:
@@ -1165,23 +2064,38 @@ class LinuxEngine:
                     state['service_name'] = None
                     save_state(cid, state)
                 if IS_WINDOWS or not service_registered:
-                    spawn_internal_daemon(cid, lf)
+                    ready_fd = spawn_daemon_with_ready_pipe(cid, lf)
+                elif _service_batch_active() and state.get('service_persistent', True):
+                    return print(f"Queued service start for {name or cid}.")
             else:
-                spawn_internal_daemon(cid, lf)
+                ready_fd = spawn_daemon_with_ready_pipe(cid, lf)
 
             print("Starting...", end="", flush=True)
-            for _ in range(40):
-                time.sleep(0.25)
-                s = load_state(cid)
-                if not s: break
-                if s['status'] == 'running':
-                    print(" OK")
+            started = time.time()
+            if ready_fd is not None:
+                ready = wait_ready_signal(ready_fd, 10.0)
+                if ready == b"1":
+                    print(f" OK ({int((time.time() - started) * 1000)}ms)")
                     if not detach: self.logs(cid, follow=True)
                     return
-                if s['status'] == 'error': return print(" Failed.")
-                print(".", end="", flush=True)
+                if ready == b"0": return print(f" Failed. See {lp}")
+                if ready == b"": return print(f" Daemon exited before starting. See {lp}")
+                return print(" Timeout.")
+
+            # systemd started the daemon, so there is no pipe; wait on state changes instead.
+            next_dot = [started + 1]
+            def tick():
+                if time.time() >= next_dot[0]:
+                    print(".", end="", flush=True)
+                    next_dot[0] += 1
+            status = wait_container_running(cid, 10, tick)
+            if status == 'running':
+                print(f" OK ({int((time.time() - started) * 1000)}ms)")
+                if not detach: self.logs(cid, follow=True)
+                return
+            if status == 'error': return print(" Failed.")
             print(" Timeout.")
-        except: shutil.rmtree(root, ignore_errors=True)
+        except: fast_rmtree(root)
 
     def stop(self, ident):
         s = load_state(ident)
@@ -1198,9 +2112,9 @@ class LinuxEngine:
         _remove_container_service(s)
         self.stop(ident)
         if 'mounts' in s:
-            for m in s['mounts']: run_quiet(['umount', '-l', m])
-        run_quiet(['umount', '-l', os.path.join(s['root'], 'proc')])
-        shutil.rmtree(s['root'], ignore_errors=True)
+            for m in s['mounts']: _umount_lazy(m)
+        _umount_lazy(os.path.join(s['root'], 'proc'))
+        fast_rmtree(s['root'])
         remove_state(s['id'])
         print("Done.")
 
@@ -1231,14 +2145,18 @@ class LinuxEngine:
 @click.command(name='internal-daemon', hidden=True)
 @click.argument('cid')
 def internal_daemon(cid):
+    os.chdir(INSTALL_DIR)
     sys.stdout.reconfigure(line_buffering=True)
     sys.stderr.reconfigure(line_buffering=True)
 
-    while True:
-        s = load_state(cid)
-        if not s:
-            return print(f"Fatal: State missing {cid}")
+    # The daemon owns this container's state for its lifetime; it is loaded
+    # once and written back only at status transitions.
+    s = load_state(cid)
+    if not s:
+        _notify_launcher(False)
+        return print(f"Fatal: State missing {cid}")
 
+    while True:
         print(f"[Daemon] Init {cid} at {datetime.now()}")
         stop = threading.Event()
 
@@ -1246,6 +2164,7 @@ def internal_daemon(cid):
             if not start_port_forwarding(cid, s['ports'], stop, sys.stdout):
                 s['status'] = 'error'
                 save_state(cid, s)
+                _notify_launcher(False)
                 return
 
         exit_code = 0
@@ -1253,17 +2172,10 @@ def internal_daemon(cid):
             cmd = s.get('command') or "sleep infinity"
             workdir = s.get('workdir', '/')
 
-            s['status'] = 'running'
-            save_state(cid, s)
-
-            print(f"[Daemon] WorkDir: {workdir}")
-            print(f"[Daemon] Running: {cmd}")
-
             volume_bindings = s.get('volume_bindings')
             if not volume_bindings:
                 volume_bindings = resolve_volume_bindings(s.get('volumes', []))
                 s['volume_bindings'] = volume_bindings
-                save_state(cid, s)
 
             if IS_WINDOWS:
                 for binding in volume_bindings:
@@ -1277,8 +2189,8 @@ def internal_daemon(cid):
                     subprocess.call(['wsl', '-d', cid, 'sh', '-c', f"echo 'export {e}' >> /etc/profile"], **_windows_hidden_process_kwargs())
 
                 subprocess.call(['wsl', '-d', cid, 'sh', '-c', 'echo "nameserver 8.8.8.8" > /etc/resolv.conf'], **_windows_hidden_process_kwargs())
-                full_cmd = f"cd {workdir} && {cmd}"
-                exit_code = subprocess.call(['wsl', '-d', cid, 'sh', '-c', full_cmd], **_windows_hidden_process_kwargs())
+                run_args = ['wsl', '-d', cid, 'sh', '-c', f"cd {workdir} && {cmd}"]
+                run_kwargs = _windows_hidden_process_kwargs()
             else:
                 mp = []
                 for binding in volume_bindings:
@@ -1286,28 +2198,40 @@ def internal_daemon(cid):
                     c = binding['target']
                     t = os.path.join(s['root'], c.lstrip('/'))
                     os.makedirs(t, exist_ok=True)
-                    subprocess.call(['mount', '--bind', h, t])
+                    _mount(h, t, flags=MS_BIND)
                     mp.append(t)
                 proc = os.path.join(s['root'], 'proc')
                 os.makedirs(proc, exist_ok=True)
-                subprocess.call(['mount', '-t', 'proc', '/proc', proc])
+                _mount('/proc', proc, 'proc')
                 s['mounts'] = mp
-                save_state(cid, s)
+                run_args = ['chroot', s['root'], '/bin/sh', '-c', f"cd {workdir} && {cmd}"]
+                run_kwargs = {}
 
-                full_cmd = f"cd {workdir} && {cmd}"
-                exit_code = subprocess.call(['chroot', s['root'], '/bin/sh', '-c', full_cmd])
+            # Status, resolved bindings and mounts go out in a single write.
+            s['status'] = 'running'
+            save_state(cid, s)
+            _notify_launcher(True)
+
+            print(f"[Daemon] WorkDir: {workdir}")
+            print(f"[Daemon] Running: {cmd}")
+            exit_code = subprocess.call(run_args, **run_kwargs)
 
         except Exception as e:
             print(f"Crash: {e}")
             exit_code = 1
+            # No-op once 'running' was reported; otherwise the launcher learns of it now.
+            _notify_launcher(False)
         finally:
             stop.set()
 
-        s = load_state(cid)
-        if not s:
+        # Only `lbox stop`/`rm` and restart-policy edits reach us from outside.
+        latest = load_state(cid)
+        if not latest:
             return
+        s['status'] = latest.get('status')
+        s['restart'] = latest.get('restart', 'no')
 
-        restart_policy = s.get('restart', 'no')
+        restart_policy = s['restart']
         restart_count = s.get('restart_count', 0)
         should_restart = False
 
@@ -1334,14 +2258,15 @@ def internal_daemon(cid):
 @click.argument('config_path')
 @click.argument('project_name')
 def monitor_daemon(config_path, project_name):
+    os.chdir(INSTALL_DIR)
     print(f"--- Auto-Update Monitor Started for {project_name} ---")
 
     last_state = {} 
+    last_stat = {}
 
     while True:
         try:
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            config = load_compose_file(config_path, os.path.join(STATE_DIR, 'compose_cache'))
 
             services = config.get('services', {})
 
@@ -1372,7 +2297,14 @@ def monitor_daemon(config_path, project_name):
                     lbox_file = os.path.join(build_path, 'app.lbox')
                     if not os.path.exists(lbox_file): lbox_file = os.path.join(build_path, 'lbox')
 
-                    if os.path.exists(lbox_file):
+                    try:
+                        st = os.stat(lbox_file)
+                    except OSError:
+                        st = None
+
+                    # Only re-hash when the file's mtime or size moved.
+                    if st and last_stat.get(name) != (st.st_mtime_ns, st.st_size):
+                        last_stat[name] = (st.st_mtime_ns, st.st_size)
                         current_hash = calculate_file_hash(lbox_file)
                         if last_state.get(name) != current_hash:
                             print(f"[Update] Local change detected for {name}")
@@ -1389,7 +2321,10 @@ def monitor_daemon(config_path, project_name):
                     if url:
                         print(f"   Downloading {url}...")
                         dest = os.path.join(IMAGES_DIR, f"{image_tag}.tar")
-                        urllib.request.urlretrieve(url, dest)
+                        download_file(url, dest)
+                        # A downloaded archive supersedes any locally built rootfs.
+                        if not IS_WINDOWS: fast_rmtree(image_rootfs(image_tag))
+                        invalidate_image_index()
                     else:
                         subprocess.call([
                             _background_python_executable(),
@@ -1425,7 +2360,8 @@ def monitor_daemon(config_path, project_name):
         except Exception as e:
             print(f"[Monitor Error] {e}")
 
-        time.sleep(10)
+        # Jittered so monitors started together do not poll in lockstep.
+        time.sleep(10 + random.uniform(-1, 1))
 
 # ==========================================
 # CLI DISPATCH
@@ -1434,23 +2370,46 @@ def monitor_daemon(config_path, project_name):
 def cli(): pass
 eng = WindowsEngine() if IS_WINDOWS else LinuxEngine()
 
+_LBOX_BASE = 'BOX_BASE'
+_LBOX_DISPATCH = {
+    'BOX_COPY': 'COPY',
+    'BOX_EXEC': 'EXEC',
+    'BOX_ENV': 'ENV',
+    'BOX_START': 'START',
+    'BOX_DIR': 'DIR',
+}
+
+def parse_lbox(path):
+    """Parse the lbox file in a build context; None when the context has none."""
+    fp = os.path.join(path, 'lbox') if os.path.exists(os.path.join(path, 'lbox')) else os.path.join(path, 'app.lbox')
+    if not os.path.exists(fp): return None
+    d = {'BASE':None,'STEPS':[]}
+    with open(fp) as f:
+        text = f.read()
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] == '#': continue
+        head, _, arg = line.partition(' ')
+        if head == _LBOX_BASE:
+            d['BASE'] = arg
+            continue
+        tag = _LBOX_DISPATCH.get(head)
+        if tag: d['STEPS'].append({'cmd':tag, 'arg':arg})
+    return d
+
+def build_image(tag, path):
+    d = parse_lbox(path)
+    if d is None:
+        print("No lbox file.")
+        return False
+    return eng.build(tag, d, path)
+
 @click.command()
 @click.option('-t', required=True)
 @click.argument('path', default='.')
 def build(path, t):
-    fp = os.path.join(path, 'lbox') if os.path.exists(os.path.join(path, 'lbox')) else os.path.join(path, 'app.lbox')
-    if not os.path.exists(fp): return print("No lbox file.")
-    d = {'BASE':None,'STEPS':[]}
-    with open(fp) as f:
-        for l in f:
-            p = l.strip().split(' ', 1)
-            if not p or l.startswith('#'): continue
-            if p[0]=='BOX_BASE': d['BASE']=p[1]
-            elif p[0] in ['BOX_COPY','BOX_EXEC']: d['STEPS'].append({'cmd':p[0][4:], 'arg':p[1]})
-            elif p[0]=='BOX_ENV': d['STEPS'].append({'cmd':'ENV', 'arg':p[1]})
-            elif p[0]=='BOX_START': d['STEPS'].append({'cmd':'START', 'arg':p[1]})
-            elif p[0]=='BOX_DIR': d['STEPS'].append({'cmd':'DIR', 'arg':p[1]})
-    eng.build(t, d, path)
+    if not build_image(t, path):
+        sys.exit(1)
 
 @click.command()
 @click.argument('image')
@@ -1463,8 +2422,9 @@ def build(path, t):
 @click.option('--label', '-l', multiple=True, help='Set metadata labels key=value')
 @click.option('--network', default='bridge')
 @click.option('--service/--no-service', default=False, help='Register container as a host-managed service.')
+@click.option('--persistent/--transient', default=True, help='With --service on Linux, write a boot-persistent unit or start a transient systemd-run unit.')
 @click.argument('cmd', required=False)
-def run(image, name, port, volume, env, detach, restart, label, network, service, cmd):
+def run(image, name, port, volume, env, detach, restart, label, network, service, persistent, cmd):
     if service and IS_WINDOWS and not is_windows_admin():
         print("Requesting Administrator privileges for --service...")
         relaunch_self_as_admin()
@@ -1475,7 +2435,7 @@ def run(image, name, port, volume, env, detach, restart, label, network, service
         raise click.ClickException(format_conflict_error('run container', conflicts))
 
     labels = parse_env_entries(label)
-    eng.run(image, name, port, volume, env, detach, cmd, restart_policy=restart, labels=labels, network=network, as_service=service)
+    eng.run(image, name, port, volume, env, detach, cmd, restart_policy=restart, labels=labels, network=network, as_service=service, persistent_service=persistent)
 
 @click.command()
 @click.argument('identifier')
@@ -1496,7 +2456,8 @@ def restart(identifier):
         "restart": s.get('restart', 'no'),
         "labels": s.get('labels', {}),
         "network": s.get('network', 'bridge'),
-        "service_enabled": s.get('service_enabled', False)
+        "service_enabled": s.get('service_enabled', False),
+        "service_persistent": s.get('service_persistent', True)
     }
 
     eng.rm(identifier)
@@ -1511,7 +2472,8 @@ def restart(identifier):
         restart_policy=config['restart'],
         labels=config['labels'],
         network=config['network'],
-        as_service=config['service_enabled']
+        as_service=config['service_enabled'],
+        persistent_service=config['service_persistent']
     )
 
 @click.command()
@@ -1570,8 +2532,7 @@ def ps(): eng.ps()
 
 @click.command()
 def images():
-    for f in os.listdir(IMAGES_DIR):
-        if f.endswith('.tar') or f.endswith('.tar.gz'): print(f)
+    for f in sorted(list_image_files()): print(f)
 
 @click.command()
 def volumes():
@@ -1599,6 +2560,10 @@ create = register_create_commands(
     list_named_volumes,
     find_container_conflicts,
     format_conflict_error,
+    batch_service_registrations,
+    container_name_index,
+    build_image,
+    wait_container_running,
 )
 
 for c in [build, run, stop, restart, inspect, rm, exec, ps, images, volumes, logs, internal_daemon, monitor_daemon]:
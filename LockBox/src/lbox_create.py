@@ -1,10 +1,14 @@
 import click
+import hashlib
+import json
 import os
 import signal
 import subprocess
 import sys
+import threading
 import time
-import yaml
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 
 def _background_python_executable():
@@ -19,6 +23,158 @@ def _background_python_executable():
     return exe
 
 
+_YAML_CACHE = {}
+
+
+def _yaml_load(f):
+    # PyYAML is imported on first parse only: a warm on-disk cache never needs it.
+    import yaml
+    return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def load_compose_file(path, cache_dir=None):
+    """Parse a compose file, re-reading it only when its mtime or size changes.
+
+    With cache_dir, the parsed result is also kept on disk as JSON so later CLI
+    invocations skip YAML parsing. The returned mapping is shared between callers
+    and must be treated as read-only.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = f"{path}:{st.st_mtime_ns}:{st.st_size}"
+    hit = _YAML_CACHE.get(path)
+    if hit and hit[0] == key:
+        return hit[1]
+
+    cache_file = None
+    if cache_dir:
+        cache_file = os.path.join(cache_dir, hashlib.sha1(path.encode()).hexdigest() + '.json')
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = json.loads(f.read())
+            if cached.get('key') == key:
+                _YAML_CACHE[path] = (key, cached['data'])
+                return cached['data']
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+    with open(path, 'rb') as f:
+        data = _yaml_load(f) or {}
+    _YAML_CACHE[path] = (key, data)
+
+    if cache_file:
+        try:
+            payload = json.dumps({'key': key, 'data': data})
+            # Only cache documents JSON reproduces exactly (no int keys, dates, ...).
+            if json.loads(payload)['data'] == data:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, 'w') as f:
+                    f.write(payload)
+                os.replace(tmp, cache_file)
+        except (OSError, TypeError, ValueError):
+            pass
+    return data
+
+
+def _process_start_time(pid):
+    """Return an opaque start-time token for a live pid, or None if it is not running.
+
+    Comparing tokens tells a live monitor apart from an unrelated process that reused its pid.
+    """
+    if os.name == 'nt':
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return None
+        try:
+            code = wintypes.DWORD()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)) or code.value != 259:  # STILL_ACTIVE
+                return None
+            times = [wintypes.FILETIME() for _ in range(4)]
+            if not kernel32.GetProcessTimes(handle, *[ctypes.byref(ft) for ft in times]):
+                return None
+            return (times[0].dwHighDateTime << 32) | times[0].dwLowDateTime
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except PermissionError:
+        pass
+    try:
+        with open(f"/proc/{pid}/stat", 'rb') as f:
+            # Field 22 (starttime); split after the parenthesised comm, which may contain spaces.
+            return int(f.read().rsplit(b')', 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _read_monitor_pid(pid_file):
+    """Return the monitor pid recorded in pid_file if that exact process is still running."""
+    try:
+        with open(pid_file) as f:
+            raw = f.read()
+    except OSError:
+        return None
+    try:
+        record = json.loads(raw)
+        if not isinstance(record, dict):
+            record = {'pid': int(record)}
+        pid = int(record['pid'])
+    except (ValueError, KeyError, TypeError):
+        return None
+    start_time = _process_start_time(pid)
+    if start_time is None:
+        return None
+    if record.get('start_time') is not None and record['start_time'] != start_time:
+        return None
+    return pid
+
+
+def _write_monitor_pid(pid_file, pid):
+    tmp = f"{pid_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(json.dumps({'pid': pid, 'start_time': _process_start_time(pid)}))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, pid_file)
+
+
+def _stop_monitor(pid, timeout=2.0):
+    """Terminate a monitor and its children, escalating to a hard kill after timeout seconds."""
+    if os.name == 'nt':
+        subprocess.run(['taskkill', '/PID', str(pid), '/T', '/F'],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    start_time = _process_start_time(pid)
+
+    def send(sig):
+        try:
+            # The monitor is spawned with setsid, so its group holds any children it started.
+            # Never signal a group we are not sure belongs to it (e.g. our own).
+            if os.getpgid(pid) == pid:
+                os.killpg(pid, sig)
+            else:
+                os.kill(pid, sig)
+        except OSError:
+            pass
+
+    send(signal.SIGTERM)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        current = _process_start_time(pid)
+        if current is None or current != start_time:
+            return
+        time.sleep(0.05)
+    send(signal.SIGKILL)
+
+
 def _normalize_services(config):
     services = config.get('services', {})
     if services is None:
@@ -28,39 +184,52 @@ def _normalize_services(config):
     return services
 
 
-def _service_start_order(services):
-    """Return service names in dependency order based on optional depends_on."""
-    pending = {name: svc or {} for name, svc in services.items()}
-    resolved = []
+def _service_start_levels(services):
+    """Return service names grouped into dependency levels based on optional depends_on.
 
-    while pending:
-        progressed = False
-        for name in list(pending.keys()):
-            svc = pending[name]
-            deps = svc.get('depends_on', [])
-            if isinstance(deps, dict):
-                deps = list(deps.keys())
-            if not isinstance(deps, list):
-                raise click.UsageError(
-                    f"Invalid depends_on for service '{name}': expected list or mapping."
-                )
+    Services in a level only depend on services in earlier levels.
+    """
+    indeg = {name: 0 for name in services}
+    children = defaultdict(list)
 
-            unknown = [dep for dep in deps if dep not in services]
-            if unknown:
-                raise click.UsageError(
-                    f"Service '{name}' depends on undefined service(s): {', '.join(unknown)}"
-                )
+    for name, svc in services.items():
+        deps = (svc or {}).get('depends_on', [])
+        if isinstance(deps, dict):
+            deps = list(deps.keys())
+        if not isinstance(deps, list):
+            raise click.UsageError(
+                f"Invalid depends_on for service '{name}': expected list or mapping."
+            )
+
+        unknown = [dep for dep in deps if dep not in services]
+        if unknown:
+            raise click.UsageError(
+                f"Service '{name}' depends on undefined service(s): {', '.join(unknown)}"
+            )
 
-            if all(dep in resolved for dep in deps):
-                resolved.append(name)
-                pending.pop(name)
-                progressed = True
+        for dep in deps:
+            indeg[name] += 1
+            children[dep].append(name)
 
-        if not progressed:
-            cycle = ", ".join(sorted(pending.keys()))
-            raise click.UsageError(f"Cyclic depends_on detected among: {cycle}")
+    level = [name for name, count in indeg.items() if count == 0]
+    levels = []
+    resolved = 0
+    while level:
+        levels.append(level)
+        resolved += len(level)
+        next_level = []
+        for name in level:
+            for child in children[name]:
+                indeg[child] -= 1
+                if indeg[child] == 0:
+                    next_level.append(child)
+        level = next_level
 
-    return resolved
+    if resolved != len(services):
+        cycle = ", ".join(sorted(name for name, count in indeg.items() if count > 0))
+        raise click.UsageError(f"Cyclic depends_on detected among: {cycle}")
+
+    return levels
 
 
 
@@ -104,6 +273,24 @@ def _resolve_service_volumes(project_name, service_volumes):
         resolved.append(f"{source}:{target.strip()}")
     return resolved
 
+def _run_concurrently(fn, items, max_workers=8):
+    """Map fn over items on a thread pool (inline for a single item), preserving order."""
+    items = list(items)
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+def _remove_orphans(eng, orphans):
+    """Stop and remove orphan containers; they have no ordering constraint, so run them concurrently."""
+    def remove(cname):
+        print(f"Removing orphan container {cname}...")
+        eng.stop(cname)
+        eng.rm(cname)
+
+    _run_concurrently(remove, sorted(orphans))
+
 def register_create_commands(
     cli,
     eng,
@@ -122,7 +309,13 @@ def register_create_commands(
     list_named_volumes,
     find_container_conflicts,
     format_conflict_error,
+    batch_service_registrations,
+    container_name_index,
+    build_image,
+    wait_container_running,
 ):
+    compose_cache_dir = os.path.join(state_dir, 'compose_cache')
+
     @cli.group()
     def create():
         """Manage multi-container projects from lockbox-create.yml."""
@@ -148,8 +341,7 @@ def register_create_commands(
 
         target_names = list(names)
         if file and os.path.exists(file):
-            with open(file, 'r') as f:
-                config = yaml.safe_load(f) or {}
+            config = load_compose_file(file, compose_cache_dir)
             project_name = os.path.basename(os.getcwd()).lower().replace(' ', '')
             services = _normalize_services(config)
             target_names.extend(_project_named_volumes(project_name, services))
@@ -183,21 +375,27 @@ def register_create_commands(
         if not os.path.exists(file):
             return print("YAML file not found.")
 
-        with open(file, 'r') as f:
-            config = yaml.safe_load(f) or {}
+        config = load_compose_file(file, compose_cache_dir)
 
         project_name = os.path.basename(os.getcwd()).lower().replace(' ', '')
         services = _normalize_services(config)
         if not services:
             return print("No services defined in compose file.")
 
-        ordered_services = _service_start_order(services)
+        start_levels = _service_start_levels(services)
+        ordered_services = [name for level in start_levels for name in level]
+        # One pass over the compose data: name -> (container name, image tag, service dict).
+        # Every later loop reads these instead of re-deriving names and defaults.
+        specs = {}
+        for name in ordered_services:
+            svc = services.get(name) or {}
+            container_name = f"{project_name}_{name}"
+            specs[name] = (container_name, svc.get('image', container_name), svc)
         container_ids = {}
 
         # Pre-flight conflict check: fail early before creating any containers.
         for name in ordered_services:
-            svc = services.get(name) or {}
-            container_name = f"{project_name}_{name}"
+            container_name, _, svc = specs[name]
             ignore_names = [container_name] if force_recreate else None
             conflicts = find_container_conflicts(
                 requested_name=container_name,
@@ -209,37 +407,55 @@ def register_create_commands(
                     format_conflict_error(f"run create up for service '{name}'", conflicts)
                 )
 
+        # One state pass up front; kept in sync as containers are removed or started.
+        known_ids = container_name_index()
+
         if remove_orphans:
-            defined = {f"{project_name}_{name}" for name in services}
-            for cname in list_project_containers(project_name):
-                if cname not in defined:
-                    print(f"Removing orphan container {cname}...")
-                    eng.stop(cname)
-                    eng.rm(cname)
+            defined = {cname for cname, _, _ in specs.values()}
+            prefix = f"{project_name}_"
+            orphans = {n for n in known_ids if n.startswith(prefix)} - defined
+            with batch_service_registrations():
+                _remove_orphans(eng, orphans)
+            for cname in orphans:
+                known_ids.pop(cname, None)
+
+        # Builds do not depend on running containers, so every image is built up front,
+        # concurrently. Services sharing a tag build it once, from the last context listed.
+        build_contexts = {}
+        if build:
+            for name in ordered_services:
+                _, image_tag, svc = specs[name]
+                if 'build' in svc:
+                    build_contexts[image_tag] = (name, svc.get('build', '.'))
 
-        needs_monitor = False
+        def build_one(image_tag):
+            name, context = build_contexts[image_tag]
+            print(f"Building {name}...")
+            return build_image(image_tag, context)
 
-        for name in ordered_services:
-            svc = services.get(name) or {}
-            container_name = f"{project_name}_{name}"
-            image_tag = svc.get('image', container_name)
+        built = dict(zip(build_contexts, _run_concurrently(build_one, build_contexts, max_workers=4)))
 
-            if 'build' in svc and build:
-                print(f"Building {name}...")
-                rc = subprocess.call([sys.executable, sys.argv[0], "build", "-t", image_tag, svc.get('build', '.')])
-                if rc != 0:
-                    print(f"Error: build failed for {name} (exit code {rc}).")
-                    continue
+        ids_lock = threading.Lock()
+        launched = set()
+
+        def start_one(name):
+            container_name, image_tag, svc = specs[name]
+
+            if 'build' in svc and build and not built.get(image_tag):
+                print(f"Error: build failed for {name}.")
+                return False
 
             if not image_exists(image_tag):
                 print(f"Error: Build failed for {name}. Image not found. Skipping.")
-                continue
+                return False
 
-            existing_id = get_id_by_name(container_name)
+            existing_id = known_ids.get(container_name)
             if existing_id and force_recreate:
                 print(f"Recreating {container_name}...")
                 eng.stop(container_name)
                 eng.rm(container_name)
+                with ids_lock:
+                    known_ids.pop(container_name, None)
                 existing_id = None
 
             if existing_id:
@@ -261,38 +477,64 @@ def register_create_commands(
                     network=svc.get('network', 'bridge'),
                     as_service=service or bool(svc.get('service', False))
                 )
-                print(f"Started {container_name}")
-
-            container_ids[name] = get_id_by_name(container_name)
-
-            if svc.get('auto-update', {}).get('enabled'):
-                needs_monitor = True
+                new_id = get_id_by_name(container_name)
+                with ids_lock:
+                    known_ids[container_name] = new_id
+                    if new_id:
+                        launched.add(name)
+
+            with ids_lock:
+                container_ids[name] = known_ids.get(container_name)
+            return bool(svc.get('auto-update', {}).get('enabled'))
+
+        # Services in one level have no depends_on between them, so they start together.
+        # Each level gets its own service batch: its flush enables the level's queued
+        # systemd units, and the next level waits until those containers are running.
+        needs_monitor = False
+        for level in start_levels:
+            with batch_service_registrations():
+                for wants_monitor in _run_concurrently(start_one, level, max_workers=16):
+                    needs_monitor |= wants_monitor
+            fresh = [name for name in level if name in launched]
+            statuses = _run_concurrently(lambda n: wait_container_running(specs[n][0]), fresh)
+            for name, status in zip(fresh, statuses):
+                if status == 'running':
+                    print(f"Started {specs[name][0]}")
+                else:
+                    print(f"Error: {specs[name][0]} did not start ({status or 'removed'}).")
 
         print("Configuring Network (Waiting for IPs)...")
 
         hosts_map = {}
-        for i in range(10):
-            all_found = True
-            for name in ordered_services:
-                cid = container_ids.get(name)
-                if cid:
-                    ip = get_container_ip(cid)
-                    if ip and ip != '127.0.0.1':
-                        hosts_map[name] = ip
-                        hosts_map[f"{project_name}_{name}"] = ip
-                    else:
-                        all_found = False
-            if all_found:
+        # Linux containers share the host network namespace: every probe answers 127.0.0.1
+        # and there is nothing to wait for. WSL distros get their address asynchronously.
+        pending = [name for name in ordered_services if container_ids.get(name)] if is_windows else []
+        delay = 0.05
+        deadline = time.monotonic() + 15
+        attempt = 0
+        while pending:
+            # Each probe is its own wsl invocation, so one round probes every pending container at once.
+            ips = _run_concurrently(lambda n: get_container_ip(container_ids[n]), pending)
+            still_pending = []
+            for name, ip in zip(pending, ips):
+                if ip and ip != '127.0.0.1':
+                    hosts_map[name] = ip
+                    hosts_map[specs[name][0]] = ip
+                else:
+                    still_pending.append(name)
+            pending = still_pending
+            if not pending or time.monotonic() >= deadline:
                 break
-            time.sleep(1)
-            if i % 3 == 0:
-                print(".", end="", flush=True)
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+            if attempt % 3 == 0:
+                print(".", end="")
+            attempt += 1
 
         print("\nInjecting DNS records...")
-        for name in ordered_services:
-            cid = container_ids.get(name)
-            if cid:
-                eng.inject_hosts(cid, hosts_map)
+        if hosts_map:
+            cids = [container_ids[name] for name in ordered_services if container_ids.get(name)]
+            _run_concurrently(lambda cid: eng.inject_hosts(cid, hosts_map), cids)
 
         print("Network Ready.")
 
@@ -300,31 +542,44 @@ def register_create_commands(
             print("[*] Auto-Update enabled. Starting monitor...")
             pid_file = os.path.join(state_dir, f"monitor_{project_name}.pid")
 
-            if os.path.exists(pid_file):
+            if _read_monitor_pid(pid_file):
                 print("Monitor already active.")
             else:
-                startupinfo = None
-                if is_windows:
-                    startupinfo = subprocess.STARTUPINFO()
-                    startupinfo.dwFlags |= 1
-                    startupinfo.wShowWindow = 0
-
-                creationflags = (0x00000008 | 0x00000200 | 0x08000000) if is_windows else 0
                 monitor_log_path = os.path.join(state_dir, f"monitor_{project_name}.log")
-                monitor_log = open(monitor_log_path, "a")
-                p = subprocess.Popen(
-                    [_background_python_executable(), sys.argv[0], "monitor-daemon", os.path.abspath(file), project_name],
-                    cwd=install_dir,
-                    creationflags=creationflags,
-                    startupinfo=startupinfo,
-                    close_fds=True,
-                    stdout=monitor_log,
-                    stderr=subprocess.STDOUT,
-                )
-                monitor_log.close()
-                with open(pid_file, 'w') as f:
-                    f.write(str(p.pid))
-                print(f"Monitor started (PID {p.pid})")
+                python_exe = _background_python_executable()
+                args = [python_exe, os.path.abspath(sys.argv[0]), "monitor-daemon", os.path.abspath(file), project_name]
+                with open(monitor_log_path, "a") as monitor_log:
+                    if not is_windows and hasattr(os, 'posix_spawn'):
+                        # No fork of this (large) CLI process; monitor-daemon chdirs to install_dir itself.
+                        pid = os.posix_spawn(
+                            python_exe,
+                            args,
+                            os.environ,
+                            file_actions=[
+                                (os.POSIX_SPAWN_DUP2, monitor_log.fileno(), 1),
+                                (os.POSIX_SPAWN_DUP2, monitor_log.fileno(), 2),
+                            ],
+                            setsid=True,
+                        )
+                    else:
+                        startupinfo = None
+                        if is_windows:
+                            startupinfo = subprocess.STARTUPINFO()
+                            startupinfo.dwFlags |= 1
+                            startupinfo.wShowWindow = 0
+
+                        creationflags = (0x00000008 | 0x00000200 | 0x08000000) if is_windows else 0
+                        pid = subprocess.Popen(
+                            args,
+                            cwd=install_dir,
+                            creationflags=creationflags,
+                            startupinfo=startupinfo,
+                            close_fds=True,
+                            stdout=monitor_log,
+                            stderr=subprocess.STDOUT,
+                        ).pid
+                _write_monitor_pid(pid_file, pid)
+                print(f"Monitor started (PID {pid})")
 
     @create.command()
     @click.option('--file', '-f', default='lockbox-create.yml')
@@ -334,42 +589,42 @@ def register_create_commands(
     def down(file, rmi, remove_orphans, volumes):
         if not os.path.exists(file):
             return
-        with open(file, 'r') as f:
-            config = yaml.safe_load(f) or {}
+        config = load_compose_file(file, compose_cache_dir)
         project_name = os.path.basename(os.getcwd()).lower().replace(' ', '')
 
         pid_file = os.path.join(state_dir, f"monitor_{project_name}.pid")
-        if os.path.exists(pid_file):
-            try:
-                with open(pid_file) as f:
-                    pid = int(f.read())
-                os.kill(pid, signal.SIGTERM)
-                print("Stopped Monitor.")
-            except Exception:
-                pass
+        pid = _read_monitor_pid(pid_file)
+        if pid:
+            _stop_monitor(pid)
+            print("Stopped Monitor.")
+        try:
             os.remove(pid_file)
+        except FileNotFoundError:
+            pass
 
         services = _normalize_services(config)
-        for name in services:
+        known_ids = container_name_index()
+
+        def take_down(name):
             cname = f"{project_name}_{name}"
-            if get_id_by_name(cname):
+            if known_ids.get(cname):
                 print(f"Stopping {cname}...")
                 eng.stop(cname)
                 eng.rm(cname)
             else:
                 remove_service_artifacts_by_container_name(cname)
 
-        if remove_orphans:
-            defined = {f"{project_name}_{name}" for name in services}
-            for cname in list_project_containers(project_name):
-                if cname not in defined:
-                    print(f"Removing orphan container {cname}...")
-                    eng.stop(cname)
-                    eng.rm(cname)
-            known_containers = set(list_project_containers(project_name))
-            for name in services:
-                cname = f"{project_name}_{name}"
-                if cname not in known_containers:
+        with batch_service_registrations():
+            # down has no ordering constraints, so services are torn down concurrently.
+            _run_concurrently(take_down, services)
+
+            if remove_orphans:
+                defined = {f"{project_name}_{name}" for name in services}
+                prefix = f"{project_name}_"
+                _remove_orphans(eng, {n for n in known_ids if n.startswith(prefix)} - defined)
+                # One fresh snapshot after the stop/rm calls above.
+                remaining = container_name_index()
+                for cname in defined - remaining.keys():
                     remove_service_artifacts_by_container_name(cname)
 
         if rmi != 'none':
@@ -1,13 +1,15 @@
-from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import functools
 import os
 import socket
+import threading
+import time
 
 from flask import Flask, jsonify
 import redis
 
 app = Flask(__name__)
 
-_REDIS_CLIENTS = {}
 _LAST_GOOD_HOST = None
 
 
@@ -24,11 +26,61 @@ def _redis_port():
     return int(os.getenv("REDIS_PORT", "6379"))
 
 
+@functools.cache
+def _pool(host, port):
+    # One pool per (host, port), shared by every request in this worker. A short connect
+    # timeout keeps the fallback sweep bounded; health checks catch connections Redis dropped.
+    return redis.ConnectionPool(
+        host=host,
+        port=port,
+        db=0,
+        socket_timeout=2,
+        socket_connect_timeout=0.2,
+        max_connections=64,
+        health_check_interval=30,
+    )
+
+
 def _get_or_create_client(host, port):
-    key = (host, port)
-    if key not in _REDIS_CLIENTS:
-        _REDIS_CLIENTS[key] = redis.Redis(host=host, port=port, db=0, socket_timeout=2)
-    return _REDIS_CLIENTS[key]
+    return redis.Redis(connection_pool=_pool(host, port))
+
+
+def _close_quietly(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _first_reachable_host(hosts, port, timeout=0.1):
+    """Race TCP handshakes to every candidate and return the first host that accepts."""
+    if len(hosts) == 1:
+        socket.create_connection((hosts[0], port), timeout=timeout).close()
+        return hosts[0]
+
+    pool = ThreadPoolExecutor(max_workers=len(hosts))
+    futures = {pool.submit(socket.create_connection, (host, port), timeout): host for host in hosts}
+    winner = None
+    last_error = None
+    try:
+        pending = set(futures)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                elif winner is None:
+                    winner = futures[future]
+                    future.result().close()
+                else:
+                    future.result().close()
+        # Losers may still be resolving or connecting; close their sockets whenever they finish.
+        for future in pending:
+            future.add_done_callback(_close_quietly)
+    finally:
+        pool.shutdown(wait=False)
+
+    if winner is None:
+        raise ConnectionError(f"Unable to connect to Redis: {last_error}")
+    return winner
 
 
 def _clear_cached_host():
@@ -45,40 +97,82 @@ def get_redis_connection(force_probe=False):
     if _LAST_GOOD_HOST and _LAST_GOOD_HOST in hosts and not force_probe:
         return _get_or_create_client(_LAST_GOOD_HOST, port), _LAST_GOOD_HOST
 
-    last_error = None
-
-    if _LAST_GOOD_HOST and _LAST_GOOD_HOST in hosts:
-        hosts = [_LAST_GOOD_HOST] + [host for host in hosts if host != _LAST_GOOD_HOST]
-
-    for host in hosts:
-        client = _get_or_create_client(host, port)
-        try:
-            client.ping()
-            _LAST_GOOD_HOST = host
-            return client, host
-        except Exception as err:
-            last_error = err
-
-    raise ConnectionError(f"Unable to connect to Redis: {last_error}")
-
-
-@app.route('/')
-def hello():
+    # Only the handshake is raced; the winner alone gets a full PING round-trip.
+    host = _first_reachable_host(hosts, port)
+    client = _get_or_create_client(host, port)
+    try:
+        client.ping()
+    except Exception as err:
+        raise ConnectionError(f"Unable to connect to Redis: {err}")
+    _LAST_GOOD_HOST = host
+    return client, host
+
+
+# Hits are counted locally and pushed to Redis in batches. The page shows the last value
+# Redis returned plus the hits not yet flushed; until a first synchronous INCR (or after a
+# failed flush) requests fall back to the exact, blocking path so errors still surface.
+_HITS_LOCK = threading.Lock()
+_HITS_FLUSH_INTERVAL = 0.1
+_pending_hits = 0
+_last_synced = None
+_flusher = None
+
+
+def _flush_hits():
+    global _pending_hits, _last_synced
+    with _HITS_LOCK:
+        n, _pending_hits = _pending_hits, 0
+    if not n:
+        return
     try:
-        r, redis_host = get_redis_connection()
-        count = r.incr('hits')
+        r, _ = get_redis_connection()
+        pipe = r.pipeline(transaction=False)
+        pipe.incrby('hits', n)
+        total = pipe.execute()[0]
     except Exception:
-        # Retry once with host probing in case cached host/client became stale.
         _clear_cached_host()
-        try:
-            r, redis_host = get_redis_connection(force_probe=True)
-            count = r.incr('hits')
-        except Exception as e:
-            return f"<h3>DB Connection Error:</h3> <p>{e}</p>", 503
-
-    server_id = socket.gethostname()
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-    return f"""
+        with _HITS_LOCK:
+            _pending_hits += n
+            _last_synced = None
+        return
+    with _HITS_LOCK:
+        _last_synced = total
+
+
+def _flush_hits_forever():
+    while True:
+        time.sleep(_HITS_FLUSH_INTERVAL)
+        _flush_hits()
+
+
+def _record_hit():
+    """Count a hit without a Redis round-trip; None when the exact path must be used."""
+    global _pending_hits, _flusher
+    with _HITS_LOCK:
+        if _last_synced is None:
+            return None
+        _pending_hits += 1
+        approx = _last_synced + _pending_hits
+        if _flusher is None:
+            # Started lazily so each forked server worker gets its own flusher.
+            _flusher = threading.Thread(target=_flush_hits_forever, daemon=True)
+            _flusher.start()
+    return approx
+
+
+def _incr_hits_now(r):
+    global _last_synced
+    with _HITS_LOCK:
+        pending = _pending_hits
+    count = r.incr('hits')
+    with _HITS_LOCK:
+        _last_synced = count
+    return count + pending
+
+
+# The hostname is fixed for the container's lifetime; the page layout never changes.
+_SERVER_ID = socket.gethostname()
+_HELLO_TEMPLATE = """
     <div style="font-family: sans-serif; text-align: center; padding-top: 50px;">
         <h1>🔒 LockBox Create Demo</h1>
         <p>I have been seen <b>{count}</b> times.</p>
@@ -86,14 +180,40 @@ def hello():
         <p><small>Time: {now}</small></p>
         <p><small>Served by Container ID: {server_id}</small></p>
     </div>
-    """
+    """.format
+
+
+@app.route('/')
+def hello():
+    count = _record_hit()
+    if count is not None:
+        redis_host = _LAST_GOOD_HOST
+    else:
+        try:
+            r, redis_host = get_redis_connection()
+            count = _incr_hits_now(r)
+        except Exception:
+            # Retry once with host probing in case cached host/client became stale.
+            _clear_cached_host()
+            try:
+                r, redis_host = get_redis_connection(force_probe=True)
+                count = _incr_hits_now(r)
+            except Exception as e:
+                return f"<h3>DB Connection Error:</h3> <p>{e}</p>", 503
+
+    t = time.gmtime()
+    now = f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d} UTC"
+    return _HELLO_TEMPLATE(count=count, redis_host=redis_host, now=now, server_id=_SERVER_ID)
 
 
 @app.route('/healthz')
 def healthz():
     try:
-        _, redis_host = get_redis_connection(force_probe=True)
-        return jsonify(status="ok", redis_host=redis_host), 200
+        r, redis_host = get_redis_connection(force_probe=True)
+        _flush_hits()
+        # Exact count: everything recorded in this worker has just been pushed.
+        hits = int(r.get('hits') or 0)
+        return jsonify(status="ok", redis_host=redis_host, hits=hits), 200
     except Exception as e:
         return jsonify(status="error", error=str(e)), 503
 
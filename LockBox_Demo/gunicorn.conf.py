@@ -0,0 +1,16 @@
+# Production server settings for the demo app: gunicorn -c gunicorn.conf.py app:app
+import multiprocessing
+import os
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = "0.0.0.0:5000"
+
+# Threaded workers overlap Redis round-trips without monkey-patching, so the
+# thread-based handshake race and hit flusher in app.py keep working unchanged.
+workers = 2 * multiprocessing.cpu_count() + 1
+worker_class = "gthread"
+threads = 16
+keepalive = 75
+
+# Don't preload: each worker builds its own Redis pools after the fork.
+preload_app = False